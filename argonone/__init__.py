@@ -7,17 +7,24 @@
 
 import smbus
 import RPi.GPIO as GPIO
-from threading import Thread, Lock
+from threading import Thread, Lock, Event
+from concurrent.futures import Future, ThreadPoolExecutor
+import queue
 import os
 from contextlib import contextmanager, nullcontext
 from enum import Enum
 import shlex
 import subprocess
+import pickle
+import struct
+import socket
 import time
 import yaml
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
-from typing import Generic, TypeVar, Sequence, List, Dict, Iterator, Tuple, Union, Optional, ContextManager
+from typing import (Generic, TypeVar, Sequence, List, Dict, Iterator, Tuple, Union, Optional, ContextManager,
+                    Callable, Any)
 
 from gi.repository import GLib
 import dbus
@@ -26,17 +33,19 @@ import dbus.mainloop.glib
 
 __all__ = [
   'ArgonOneHardware', 'BUTTON_PRESS', 'get_pi_temperature', 'StepFunction',
-  'ArgonDaemon', 'dbus_proxy', 'NOTIFY',
+  'ArgonDaemon', 'dbus_proxy', 'NOTIFY', 'TRACE_EVENT', 'read_trace',
 ]
 
 dbus.mainloop.glib.threads_init()
 log = logging.getLogger("argononed")
 
+# Position is stored in trace files (see TRACE_EVENT.NOTIFY), so only append
 NOTIFY = Enum('NOTIFY', [
   ('VALUE_TEMPERATURE', "temperature"),
   ('VALUE_FAN_SPEED', "fan_speed"),
   ('VALUE_FAN_CONTROL_ENABLED', "fan_control_enabled"),
   ('VALUE_POWER_CONTROL_ENABLED', "power_control_enabled"),
+  ('VALUE_FAN_PROFILE', "fan_profile"),
   ('EVENT_SHUTDOWN', "shutdown_request"),
   ('EVENT_REBOOT', "reboot_request"),
   ('EVENT_FAN_SPEED_LUT_CHANGED', "fan_speed_lut_changed"),
@@ -47,11 +56,30 @@ BUTTON_PRESS = Enum('BUTTON_PRESS', [
   'REBOOT',
 ])
 
+# Trace record types; values are stored in trace files, so do not reorder
+TRACE_EVENT = Enum('TRACE_EVENT', [
+  'TEMPERATURE',  # Input: temperature reading (NaN if failed)
+  'LOAD',         # Input: load reading
+  'FAN_WRITE',    # Output: fan speed after I2C write
+  'BUTTON',       # Input: power button press (BUTTON_PRESS value)
+  'FAN_SET',      # Input: fan speed set externally (e.g., via D-Bus)
+  'FAN_CONTROL',  # Input: fan control enabled (1) or disabled (0) externally
+  'FAN_PROFILE',  # Input: fan profile switch (index into sorted profile names)
+  'POWER_CONTROL',  # Input: power control enabled (1) or disabled (0) externally
+  'LUT_APPLY_SUGGESTED',  # Input: suggested LUT applied externally
+  'LUT_SET',      # Input: LUT set externally (LUT itself is not recorded)
+  'NOTIFY',       # Output: notification (position in NOTIFY)
+  'FAN_FAILSAFE',  # Input: fan speed forced by watchdog (recorded after successful write)
+])
+
 ############################################################################
 # Constants (private)
 
 _SHUTDOWN_BCM_PIN = 4
 _SHUTDOWN_GPIO_TIMEOUT_MS = 10000
+_SHUTDOWN_DEADLINE_SEC = 2.0  # Approximate; board firmware cuts power after a short, fixed delay
+_SHUTDOWN_RESERVE_SEC = 0.5   # Portion of deadline reserved for the shutdown command itself
+_SHUTDOWN_HOOK_TIMEOUT_SEC = 1.0
 _SMBUS_DEV = 1 if GPIO.RPI_INFO['P1_REVISION'] > 1 else 0
 _SMBUS_ADDRESS = 0x1a
 _SMBUS_REGISTER = 0x00
@@ -59,10 +87,29 @@ _SMBUS_VALUE_ACK = 0x00  # Official scripts use 0x00, other values could work?
 _SMBUS_VALUE_POWEROFF = 0xff
 _VCGENCMD_PATH = '/usr/bin/vcgencmd'
 _SYSFS_TEMPERATURE_PATH = '/sys/class/thermal/thermal_zone0/temp'
+_DEFAULT_FAN_PROFILE = 'default'  # Name of profile defined by top-level fan_control settings
+_AUTOTUNE_MAX_LOAD_CHANGE = 0.1  # Ignore speed switches if (normalized) load changed more than this
+_AUTOTUNE_APPLY_INTERVAL = 30  # Re-evaluate automatically applied LUT every this many samples
+_TRACE_MAGIC = b'ARGNTRC2'
+_TRACE_RECORD = struct.Struct('<Bdd')  # event type, seconds since start, value
+_LOG_RATE_INTERVAL_SEC = 60.0
+_LOG_RATE_BURST = 5  # Max messages with same key per interval
 _CONFIG_LOCATIONS = [
   '/etc/argonone.yaml',
   '$HOME/.config/argonone.yaml',   # XXX - is this safe??
 ]
+_CONFIG_CACHE_FILENAME = 'config.pickle'
+_CONFIG_CACHE_VERSION = 7  # Bump whenever ArgonDaemon.compile_config output changes
+_DBUS_READY_TIMEOUT_SEC = 5.0
+_DBUS_HEARTBEAT_SEC = 10
+_WATCHDOG_CHECK_INTERVAL_SEC = 5.0  # If systemd watchdog is not enabled
+_WATCHDOG_FAILSAFE_SPEED = 100
+_WATCHDOG_STALL_FACTOR = 3.0  # Subsystem is stalled if heartbeat is this many times its interval late
+_WATCHDOG_BUS_TIMEOUT_SEC = 2.0  # How long failsafe waits for I2C bus (if another thread holds it)
+_SUBSYSTEM_READY_TIMEOUT_SEC = 10.0
+
+# Use libyaml-based loader, if available
+_YAMLLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 
 ############################################################################
@@ -71,6 +118,7 @@ _CONFIG_LOCATIONS = [
 class ArgonOneBoard:
   _fan_speed: Optional[int]
   _bus_mutex: Union[ContextManager, Lock]
+  _last_press_time: Optional[float]
 
   def __init__(self, initial_speed: Optional[int] = 0, bus_mutex: Optional[Lock] = None):
     self._bus_mutex = bus_mutex if bus_mutex is not None else nullcontext()
@@ -80,6 +128,7 @@ class ArgonOneBoard:
       self.fan_speed = initial_speed  # sets self._fan_speed, and also issues I2C command
     else:
       self._fan_speed = None  # self._fan_speed still needs to be defined
+    self._last_press_time = None
     # Set up GPIO pin to listen for power button presses
     GPIO.setwarnings(False)
     GPIO.setmode(GPIO.BCM)
@@ -95,12 +144,16 @@ class ArgonOneBoard:
 
   @property
   def fan_speed(self) -> Optional[int]:
-    # Since modifying fan_speed property involves bus write, we also protect this access...
-    with self._bus_mutex:
-      return self._fan_speed
+    # Not guarded by bus mutex, which is held for the duration of (possibly slow)
+    # writes; attribute reads are atomic, and value is only updated after writes
+    return self._fan_speed
 
   @fan_speed.setter
   def fan_speed(self, value: int) -> None:
+    self.set_fan_speed(value)
+
+  # Returns False if I2C write failed (speed is then unchanged)
+  def set_fan_speed(self, value: int) -> bool:
     # Threshold speed value between 0 and 100 (inclusive)
     value = int(max(min(value, 100), 0))
     # Send I2C command
@@ -108,8 +161,26 @@ class ArgonOneBoard:
       try:
         self._bus_write(value)
         self._fan_speed = value  # Only update if write was successful
+        return True
       except IOError:
         log.warn("Fan control I2C command failed")
+        return False
+
+  # For emergencies, when another thread may be stuck holding the bus
+  # (e.g., in a hung write); returns False if speed could not be set
+  def force_fan_speed(self, value: int, timeout: float) -> bool:
+    assert self.is_threadsafe
+    value = int(max(min(value, 100), 0))
+    if not self._bus_mutex.acquire(timeout=timeout):  # type: ignore
+      return False
+    try:
+      self._bus_write(value)
+      self._fan_speed = value
+      return True
+    except IOError:
+      return False
+    finally:
+      self._bus_mutex.release()  # type: ignore
 
   # XXX Originally assumed this would serve as an "ACK", to prevent board
   #   from cutting power, but that is not the case. In fact, the board will
@@ -135,11 +206,12 @@ class ArgonOneBoard:
     # Both ranges are inclusive-exlcuside
     if GPIO.wait_for_edge(_SHUTDOWN_BCM_PIN, GPIO.RISING, timeout=timeout) is None:
       return None  # Timed out
-    rise_time = time.time()
+    rise_time = time.monotonic()
+    self._last_press_time = rise_time
     if GPIO.wait_for_edge(_SHUTDOWN_BCM_PIN, GPIO.FALLING, timeout=500) is None:
       log.warn("Power button monitor giving up on pulse that seems to exceed 500msec!")
       return None
-    pulse_time = time.time() - rise_time
+    pulse_time = time.monotonic() - rise_time
     if 0.01 <= pulse_time < 0.03:
       return BUTTON_PRESS.REBOOT
     elif 0.03 <= pulse_time < 0.05:
@@ -147,6 +219,11 @@ class ArgonOneBoard:
     else:
       return None
 
+  @property
+  def last_press_time(self) -> Optional[float]:
+    # Monotonic clock time of most recent button signal rising edge
+    return self._last_press_time
+
   def close(self) -> None:
     self._bus.close()
 
@@ -154,6 +231,60 @@ class ArgonOneBoard:
     self.close()
 
 
+############################################################################
+# Recording of hardware interactions (see argonone.replay for playback)
+
+# Appends fixed-size binary records to a trace file; thread-safe
+class TraceRecorder:
+  def __init__(self, path: str):
+    self._fp = open(path, 'wb')
+    self._fp.write(_TRACE_MAGIC)
+    self._start_time = time.monotonic()
+    self._mutex = Lock()
+
+  def record(self, event: TRACE_EVENT, value: Optional[float]) -> None:
+    elapsed = time.monotonic() - self._start_time
+    data = _TRACE_RECORD.pack(event.value, elapsed, float('nan') if value is None else value)
+    with self._mutex:
+      if not self._fp.closed:
+        self._fp.write(data)
+        self._fp.flush()  # Records are infrequent, and we want them even if daemon dies
+
+  def close(self) -> None:
+    with self._mutex:
+      self._fp.close()
+
+
+def read_trace(path: str) -> Iterator[Tuple[TRACE_EVENT, float, Optional[float]]]:
+  with open(path, 'rb') as fp:
+    if fp.read(len(_TRACE_MAGIC)) != _TRACE_MAGIC:
+      raise ValueError(f"{path} is not an ArgonOne trace file")
+    while True:
+      data = fp.read(_TRACE_RECORD.size)
+      if len(data) < _TRACE_RECORD.size:
+        break  # Ignore truncated last record (e.g., if daemon died)
+      event_value, elapsed, value = _TRACE_RECORD.unpack(data)
+      yield TRACE_EVENT(event_value), elapsed, (None if value != value else value)  # NaN -> None
+
+
+class RecordingArgonOneBoard(ArgonOneBoard):
+  def __init__(self, recorder: TraceRecorder, *args, **kwargs):
+    self._recorder = recorder  # Before base constructor, which may write initial speed
+    super().__init__(*args, **kwargs)
+
+  def _bus_write(self, value: int, register: int = _SMBUS_REGISTER):
+    super()._bus_write(value, register)
+    # Only record (successful) fan speed writes
+    if register == _SMBUS_REGISTER and 0 <= value <= 100:
+      self._recorder.record(TRACE_EVENT.FAN_WRITE, value)
+
+  def wait_for_button(self, timeout: int = _SHUTDOWN_GPIO_TIMEOUT_MS) -> Optional[BUTTON_PRESS]:
+    button_press = super().wait_for_button(timeout)
+    if button_press is not None:
+      self._recorder.record(TRACE_EVENT.BUTTON, button_press.value)
+    return button_press
+
+
 ############################################################################
 # Auxilliary classes and functions
 
@@ -161,6 +292,25 @@ def _is_monotone_increasing(seq: Sequence) -> bool:
   return all(seq[i-1] < seq[i] for i in range(1, len(seq)))
 
 
+# Summary statistics over a stream of values, in O(1) time and space
+class RunningStats:
+  def __init__(self):
+    self.count = 0
+    self.total = 0.0
+    self.max = 0.0
+    self.last = 0.0
+
+  def update(self, value: float) -> None:
+    self.count += 1
+    self.total += value
+    self.max = value if self.count == 1 else max(self.max, value)
+    self.last = value
+
+  @property
+  def mean(self) -> float:
+    return self.total / self.count if self.count > 0 else 0.0
+
+
 # XXX failed to get this working
 # from abc import abstractmethod, ABCMeta
 # class Comparable(metaclass=ABCMeta):
@@ -225,6 +375,120 @@ class StepFunction(Generic[K, V]):  # noqa: E302
     yield from zip(self._thresholds, self._values[1:])  # XXX use itertools.islice?
 
 
+############################################################################
+# Logging (non-blocking and rate-limited)
+
+# Limits number of records with the same key (logger, level and unformatted
+# message) to burst per interval.  The first record let through after
+# suppression is annotated with the number of suppressed records; if no
+# such record arrives, flush_expired() produces a summary record instead.
+class RateLimitFilter(logging.Filter):
+  def __init__(self, interval_sec: float = _LOG_RATE_INTERVAL_SEC, burst: int = _LOG_RATE_BURST):
+    super().__init__()
+    self._interval = interval_sec
+    self._burst = burst
+    self._windows: Dict[Tuple, List] = {}  # key -> [window start, count, suppressed count]
+    self._mutex = Lock()
+
+  @property
+  def interval(self) -> float:
+    return self._interval
+
+  def filter(self, record: logging.LogRecord) -> bool:
+    key = (record.name, record.levelno, record.msg)
+    now = time.monotonic()
+    suppressed = 0
+    with self._mutex:
+      try:
+        window = self._windows.get(key)
+      except TypeError:  # Unhashable msg object, don't bother
+        return True
+      if window is None or now - window[0] >= self._interval:
+        if window is not None:
+          suppressed = window[2]
+        self._windows[key] = [now, 1, 0]
+      elif window[1] < self._burst:
+        window[1] += 1
+      else:
+        window[2] += 1
+        return False
+    if suppressed > 0:
+      record.msg = f"{record.getMessage()} [{suppressed} similar messages suppressed]"
+      record.args = None
+    return True
+
+  # Removes expired windows (or all windows, if final), and returns summary
+  # records for those that suppressed anything
+  def flush_expired(self, final: bool = False) -> List[logging.LogRecord]:
+    now = time.monotonic()
+    summaries = []
+    with self._mutex:
+      for key, window in list(self._windows.items()):
+        if not final and now - window[0] < self._interval:
+          continue
+        del self._windows[key]
+        if window[2] > 0:
+          name, levelno, msg = key
+          summaries.append(logging.LogRecord(name, levelno, __file__, 0, "%d messages like '%s' suppressed",
+                                             (window[2], msg), None))
+    return summaries
+
+
+class _AsyncLogHandler(QueueHandler):
+  def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+    # Unlike base class, do not format here; defer all formatting to
+    # listener thread (we only log immutable values, so this is safe)
+    return record
+
+
+# Also reports suppressed records of bursts that simply stopped; these are
+# checked for whenever the queue is idle, and at least once per second
+class _AsyncLogListener(QueueListener):
+  def __init__(self, log_queue: queue.SimpleQueue, handler: logging.Handler, rate_filter: RateLimitFilter):
+    super().__init__(log_queue, handler, respect_handler_level=True)  # type: ignore
+    self._rate_filter = rate_filter
+    self._flush_interval = min(rate_filter.interval, 1.0)
+    self._next_flush = time.monotonic() + self._flush_interval
+
+  def _flush_suppressed(self, final: bool = False) -> None:
+    for record in self._rate_filter.flush_expired(final):
+      self.handle(record)
+
+  def dequeue(self, block: bool) -> logging.LogRecord:
+    while True:
+      now = time.monotonic()
+      if now >= self._next_flush:
+        self._flush_suppressed()
+        self._next_flush = now + self._flush_interval
+      try:
+        return self.queue.get(block, timeout=self._flush_interval if block else None)
+      except queue.Empty:
+        if not block:
+          raise
+
+  def stop(self) -> None:
+    super().stop()
+    self._flush_suppressed(final=True)  # Listener thread has exited, so this is safe
+
+
+# Installs a non-blocking handler on root logger; records are rate-limited
+# in the calling thread and then written by the returned (started) listener.
+# Caller should stop() the listener on exit, to flush pending records.
+def setup_async_logging(handler: logging.Handler, level: int = logging.INFO,
+                        rate_interval_sec: float = _LOG_RATE_INTERVAL_SEC,
+                        rate_burst: int = _LOG_RATE_BURST) -> QueueListener:
+  log_queue: queue.SimpleQueue = queue.SimpleQueue()
+  queue_handler = _AsyncLogHandler(log_queue)  # type: ignore
+  rate_filter = RateLimitFilter(rate_interval_sec, rate_burst)
+  queue_handler.addFilter(rate_filter)
+  root_logger = logging.getLogger()
+  root_logger.addHandler(queue_handler)
+  root_logger.setLevel(level)
+  listener = _AsyncLogListener(log_queue, handler, rate_filter)
+  listener.start()
+  return listener
+
+
 # vcgencmd-based implementation
 # def get_pi_temperature() -> Optional[float]:
 #   result = subprocess.run([_VCGENCMD_PATH, 'measure_temp'], capture_output=True)
@@ -243,6 +507,115 @@ def get_pi_temperature() -> Optional[float]:
     return None
 
 
+# Normalized (per-core) 1-minute load average
+def get_pi_load() -> float:
+  return os.getloadavg()[0] / (os.cpu_count() or 1)
+
+
+############################################################################
+# Shutdown sequencing
+
+class ShutdownHook(object):
+  __slots__ = ['cmd', 'cmdargs', 'timeout_sec']
+
+  @classmethod
+  def from_config(cls, hook_config: Union[str, Dict]) -> 'ShutdownHook':
+    # Hooks can be given either as a plain command string, or as a dict
+    if isinstance(hook_config, str):
+      return cls(hook_config)
+    if 'cmd' not in hook_config:
+      raise ValueError("Pre-shutdown hook must specify cmd")
+    return cls(hook_config['cmd'], hook_config.get('timeout_sec', _SHUTDOWN_HOOK_TIMEOUT_SEC))
+
+  def __init__(self, cmd: str, timeout_sec: float = _SHUTDOWN_HOOK_TIMEOUT_SEC):
+    if timeout_sec <= 0:
+      raise ValueError("Pre-shutdown hook timeout must be positive")
+    self.cmd = cmd
+    self.cmdargs = shlex.split(cmd)
+    self.timeout_sec = float(timeout_sec)
+
+
+# Runs pre-shutdown hooks (in parallel) and then launches the shutdown command,
+# all on a separate thread, racing against the board's power-cut deadline.
+# The deadline clock starts at the button press edge, if known.
+class ShutdownOrchestrator:
+  def __init__(self, shutdown_cmd: str, hooks: Sequence[ShutdownHook] = (),
+               deadline_sec: float = _SHUTDOWN_DEADLINE_SEC, reserve_sec: float = _SHUTDOWN_RESERVE_SEC):
+    self._shutdown_cmdargs = shlex.split(shutdown_cmd)
+    self._hooks = tuple(hooks)
+    self._deadline = deadline_sec
+    self._reserve = reserve_sec
+    self._thread: Optional[Thread] = None
+    self._mutex = Lock()
+
+  def start(self, start_time: Optional[float] = None) -> bool:
+    # Returns False if a shutdown is already in progress
+    if start_time is None:
+      start_time = time.monotonic()
+    with self._mutex:
+      if self._thread is not None:
+        return False
+      self._thread = Thread(target=self._run, args=(start_time,), name='argonone-shutdown', daemon=True)
+    self._thread.start()
+    return True
+
+  def _log_stage(self, stage: str, start_time: float) -> None:
+    elapsed = time.monotonic() - start_time
+    log.info("Shutdown %s after %.0f msec (%.0f%% of %.1f sec deadline)",
+             stage, 1000 * elapsed, 100 * elapsed / self._deadline, self._deadline)
+
+  def _run_hooks(self, start_time: float) -> None:
+    hooks_deadline = start_time + self._deadline - self._reserve
+    hooks_start = time.monotonic()
+    procs = []
+    for hook in self._hooks:
+      try:
+        procs.append((hook, subprocess.Popen(hook.cmdargs)))
+      except OSError as exc:
+        log.warning("Failed to launch pre-shutdown hook '%s': %s", hook.cmd, exc)
+    # All hooks are already running; just collect them, in order
+    for hook, proc in procs:
+      timeout = min(hooks_start + hook.timeout_sec, hooks_deadline) - time.monotonic()
+      try:
+        status = proc.wait(timeout=max(timeout, 0.0))
+        log.info("Pre-shutdown hook '%s' finished with status %d", hook.cmd, status)
+      except subprocess.TimeoutExpired:
+        log.warning("Pre-shutdown hook '%s' timed out, killing it", hook.cmd)
+        proc.kill()
+        proc.wait()
+
+  def _run(self, start_time: float) -> None:
+    success = False
+    try:
+      success = self._run_sequence(start_time)
+    finally:
+      if not success:
+        # Allow another button press to retry (e.g., after fixing sudoers)
+        with self._mutex:
+          self._thread = None
+
+  # Returns True if shutdown command was launched and exited successfully
+  def _run_sequence(self, start_time: float) -> bool:
+    try:
+      self._log_stage("sequence started", start_time)
+      if len(self._hooks) > 0:
+        self._run_hooks(start_time)
+        self._log_stage("hooks completed", start_time)
+    except Exception:
+      # Hooks are best-effort; never let them prevent the shutdown itself
+      log.exception("Pre-shutdown stage failed")
+    log.info("Issuing shutdown command")
+    try:
+      proc = subprocess.Popen(self._shutdown_cmdargs)
+    except OSError as exc:
+      log.error("Failed to launch shutdown command: %s", exc)
+      return False
+    self._log_stage("command launched", start_time)
+    status = proc.wait()
+    self._log_stage(f"command exited with status {status}", start_time)
+    return status == 0
+
+
 ############################################################################
 # Power button monitoring and control
 
@@ -251,13 +624,15 @@ def get_pi_temperature() -> Optional[float]:
 # Anything related to power button should be delegated here.
 class PowerControlThread(Thread):
   def __init__(self, daemon: 'ArgonDaemon', argon_board: ArgonOneBoard,
-               reboot_cmd: str, shutdown_cmd: str, *args, **kwargs):
+               reboot_cmd: str, shutdown: ShutdownOrchestrator,
+               run_cmd: Callable[[List[str]], Any] = subprocess.run, *args, **kwargs):
     super().__init__(*args, **kwargs)
     self.argon_daemon = daemon  # XXX use weakref?
     self._argon_board = argon_board
     assert self._argon_board.is_threadsafe
     self._reboot_cmdargs = shlex.split(reboot_cmd)
-    self._shutdown_cmdargs = shlex.split(shutdown_cmd)
+    self._shutdown = shutdown
+    self._run_cmd = run_cmd
     self._control_enabled = True
 
   @property
@@ -274,30 +649,34 @@ class PowerControlThread(Thread):
     self.argon_daemon.notify(NOTIFY.VALUE_POWER_CONTROL_ENABLED, True)
     log.info("Power button control enabled")
 
+  def handle_button(self, button_press: Optional[BUTTON_PRESS]) -> None:
+    # XXX Originally assumed this would serve as an "ACK",
+    #   but that is not the case (see comment above)
+    # if button_press is not None:
+    #   self._argon_board.power_ack()
+    if button_press == BUTTON_PRESS.REBOOT:
+      log.info("Power button reboot detected")
+      self.argon_daemon.notify(NOTIFY.EVENT_REBOOT)
+      if self._control_enabled:
+        log.info("Issuing reboot command")
+        self._run_cmd(self._reboot_cmdargs)
+    elif button_press == BUTTON_PRESS.SHUTDOWN:
+      log.info("Power button shutdown detected")
+      # Start deadline clock first; notification is not on the critical path
+      if not self._shutdown.start(self._argon_board.last_press_time):
+        log.info("Shutdown already in progress")
+      self.argon_daemon.notify(NOTIFY.EVENT_SHUTDOWN)
+      if not self._control_enabled:
+        log.warn("Ignoring disabled power control; ArgonOne will cut power in a hurry anyway")
+
   def run(self):
     log.info("Power button monitoring and control thread starting")
     self._stop_requested = False
     while not self._stop_requested:
-      log.info("DBG: calling .wait_for_button")
+      self.argon_daemon.heartbeat('power_control', _SHUTDOWN_GPIO_TIMEOUT_MS / 1000 + 0.5)
       button_press = self._argon_board.wait_for_button()
-      log.info("DBG: button_press = %s", button_press)
-      # XXX Originally assumed this would serve as an "ACK",
-      #   but that is not the case (see comment above)
-      # if button_press is not None:
-      #   self._argon_board.power_ack()
-      if button_press == BUTTON_PRESS.REBOOT:
-        log.info("Power button reboot detected")
-        self.argon_daemon.notify(NOTIFY.EVENT_REBOOT)
-        if self._control_enabled:
-          log.info("Issuing reboot command")
-          subprocess.run(self._reboot_cmdargs)
-      elif button_press == BUTTON_PRESS.SHUTDOWN:
-        log.info("Power button shutdown detected")
-        self.argon_daemon.notify(NOTIFY.EVENT_SHUTDOWN)
-        if not self._control_enabled:
-          log.warn("Ignoring disabled power control; ArgonOne will cut power in a hurry anyway")
-        log.info("Issuing shutdown command")
-        subprocess.run(self._shutdown_cmdargs)
+      log.debug("button_press = %s", button_press)
+      self.handle_button(button_press)
     log.info("Power button monitoring and control thread exiting")
 
   def stop(self):
@@ -310,36 +689,240 @@ class PowerControlThread(Thread):
 LUTFunction = StepFunction[float, int]
 LUTItemIterator = ItemIterator[float, int]
 
+# Pre-compiled (and validated) fan control settings, which can be switched as a whole
+class FanProfile(object):
+  __slots__ = ['name', 'lut', 'hysteresis_sec', 'poll_interval_sec']
+
+  @classmethod
+  def from_config(cls, name: str, profile_config: dict,
+                  hysteresis_sec: float, poll_interval_sec: float) -> 'FanProfile':
+    # hysteresis_sec and poll_interval_sec are defaults, if not specified
+    if 'speed_lut' not in profile_config:
+      raise ValueError(f"Fan profile {name} must specify speed_lut")
+    return cls(name, StepFunction.from_config_lut(profile_config['speed_lut']),
+               float(profile_config.get('hysteresis_sec', hysteresis_sec)),
+               float(profile_config.get('poll_interval_sec', poll_interval_sec)))
+
+  def __init__(self, name: str, lut: LUTFunction, hysteresis_sec: float, poll_interval_sec: float):
+    if hysteresis_sec < 0:
+      raise ValueError(f"Fan profile {name} hysteresis must be non-negative")
+    if poll_interval_sec <= 0:
+      raise ValueError(f"Fan profile {name} poll interval must be positive")
+    self.name = name
+    self.lut = lut
+    self.hysteresis_sec = hysteresis_sec
+    self.poll_interval_sec = poll_interval_sec
+
+
+# Time-of-day schedule of fan profile switches; each entry is in effect
+# from its time until the next entry's time (wrapping around midnight)
+class FanProfileSchedule:
+  @classmethod
+  def from_config(cls, schedule_config: Sequence[dict]) -> 'FanProfileSchedule':
+    entries = []
+    for entry in schedule_config:
+      if 'at' not in entry or 'profile' not in entry:
+        raise ValueError("Fan profile schedule entries must specify at and profile")
+      entries.append((cls._parse_time(entry['at']), str(entry['profile'])))
+    return cls(entries)
+
+  # Returns minute of day.  YAML (1.1) reads unquoted times like 18:00 as
+  # base-60 integers (i.e., 1080), which conveniently are minutes of day
+  @staticmethod
+  def _parse_time(at: Union[str, int]) -> int:
+    if isinstance(at, int) and not isinstance(at, bool):
+      if not (0 <= at < 24 * 60):
+        raise ValueError(f"Fan profile schedule time {at} is out of range (quote HH:MM times)")
+      return at
+    try:
+      hours, minutes = (int(v) for v in str(at).split(':'))
+    except ValueError:
+      raise ValueError(f"Fan profile schedule time {at} is not HH:MM (quote HH:MM times)")
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+      raise ValueError(f"Fan profile schedule time {at} is out of range")
+    return 60 * hours + minutes
+
+  def __init__(self, entries: Sequence[Tuple[int, str]]):
+    if len(entries) < 1:
+      raise ValueError("Fan profile schedule is empty")
+    self._entries = sorted(entries)
+    if not _is_monotone_increasing([minute for minute, _ in self._entries]):
+      raise ValueError("Fan profile schedule times are not distinct")
+
+  @property
+  def profile_names(self) -> List[str]:
+    return [name for _, name in self._entries]
+
+  def scheduled_profile(self, now: time.struct_time) -> str:
+    minute_of_day = 60 * now.tm_hour + now.tm_min
+    name = self._entries[-1][1]  # Before first entry, last entry (from previous day) is in effect
+    for minute, entry_name in self._entries:
+      if minute > minute_of_day:
+        break
+      name = entry_name
+    return name
+
+
+# Online model of how effective the fan is, learned from live samples.
+# Since the LUT picks fan speed from temperature, faster speeds are always
+# observed at higher temperatures, so comparing temperatures across speeds
+# would mix up cause and effect.  Instead, whenever speed switches at a poll,
+# the rate of temperature change over the interval just before the switch is
+# compared with the rate over the interval just after; temperature and load
+# are matched (approximately), so the difference is the extra cooling rate
+# bought by the faster speed.  Mean differences are kept per speed pair,
+# by running sums, so updates are O(1) and no history is kept.
+# The model is used to find the speed above which the fan buys less than
+# tolerance_c_per_min of extra cooling, and cap LUT values accordingly.
+# Sensor noise biases differences upwards (the reading that triggered the
+# switch counts towards both rates), so the model errs towards not capping.
+class FanEffectivenessModel:
+  def __init__(self, tolerance_c_per_min: float = 0.5, min_samples: int = 30,
+               min_speed: int = 50, safety_temp: float = 60.0):
+    if tolerance_c_per_min <= 0:
+      raise ValueError("Auto-tune tolerance must be positive")
+    if min_samples < 2:
+      raise ValueError("Auto-tune min_samples must be at least 2")
+    self._tolerance = tolerance_c_per_min
+    self._min_samples = min_samples
+    self._min_speed = int(max(min(min_speed, 100), 0))
+    self._safety_temp = safety_temp
+    self._effects: Dict[Tuple[int, int], List] = {}  # (lower, higher speed) -> [n, sum of effects]
+    self._prev_temperature: Optional[float] = None
+    self._prev_interval: Optional[Tuple[int, float, float]] = None  # speed, rate, load
+    self._num_samples = 0
+    self._mutex = Lock()
+
+  @property
+  def num_samples(self) -> int:
+    return self._num_samples
+
+  # Forgets previous readings, e.g., when a reading failed or the poll interval changed
+  def reset(self) -> None:
+    with self._mutex:
+      self._prev_temperature = None
+      self._prev_interval = None
+
+  # Called on every poll, with the speed in effect since the previous poll
+  # (None if unknown, e.g., if it was changed in between polls)
+  def update(self, fan_speed: Optional[int], temperature: float, load: float, interval_sec: float) -> None:
+    with self._mutex:
+      prev_temperature, prev_interval = self._prev_temperature, self._prev_interval
+      self._prev_temperature = temperature
+      if fan_speed is None or prev_temperature is None:
+        self._prev_interval = None
+        return
+      rate = 60.0 * (temperature - prev_temperature) / interval_sec  # Degrees per minute
+      self._prev_interval = (fan_speed, rate, load)
+      if prev_interval is None:
+        return
+      prev_speed, prev_rate, prev_load = prev_interval
+      if prev_speed == fan_speed or abs(load - prev_load) > _AUTOTUNE_MAX_LOAD_CHANGE:
+        return
+      # Positive if faster speed cools more
+      if fan_speed > prev_speed:
+        key, effect = (prev_speed, fan_speed), prev_rate - rate
+      else:
+        key, effect = (fan_speed, prev_speed), rate - prev_rate
+      sums = self._effects.setdefault(key, [0, 0.0])
+      sums[0] += 1
+      sums[1] += effect
+      self._num_samples += 1
+
+  # Lowest speed such that all observed switches between it and top_speed
+  # bought less than tolerance of extra cooling; None if no saturation is evident
+  def saturation_speed(self, top_speed: int = 100) -> Optional[int]:
+    with self._mutex:
+      effects = {key: total / n for key, (n, total) in self._effects.items() if n >= self._min_samples}
+    # A faster speed heating up is not physical (e.g., ambient temperature changed
+    # systematically), so the model cannot be trusted
+    if any(effect < -self._tolerance for effect in effects.values()):
+      return None
+    # Walk down from top speed, through switches that bought (almost) no extra cooling
+    cap = top_speed
+    while True:
+      lower = [lo for (lo, hi), effect in effects.items() if hi == cap and effect <= self._tolerance]
+      if len(lower) == 0:
+        break
+      lo = max(lower)
+      if any(effect > self._tolerance for (other_lo, other_hi), effect in effects.items()
+             if other_lo >= lo and other_hi <= cap):
+        break
+      cap = lo
+    cap = max(cap, self._min_speed)
+    if cap >= top_speed:
+      return None
+    return cap
+
+  # Caps values of base_lut at saturation speed, except for entries at or
+  # above safety_temp; returns None if there is not enough data yet
+  def suggest_lut(self, base_lut: LUTFunction) -> Optional[LUTFunction]:
+    capped = [val for thr, val in base_lut.items() if thr is None or thr < self._safety_temp]
+    cap = self.saturation_speed(max(capped))
+    if cap is None:
+      return None
+    return StepFunction.from_iterator(
+      (thr, val if thr is not None and thr >= self._safety_temp else min(val, cap))
+      for thr, val in base_lut.items()
+    )
+
+
 # Point-of-authority for fan and temperature.
 # Monitors temperature, and controls fan.
 # Anything related to fan and temperature should be delegated here.
 class FanControlThread(Thread):  # noqa: E302
-  def __init__(self, daemon: 'ArgonDaemon', argon_board: ArgonOneBoard, fan_speed_lut: LUTFunction,
-               hysteresis_sec: float, poll_interval_sec: float, *args, **kwargs):
+  def __init__(self, daemon: 'ArgonDaemon', argon_board: ArgonOneBoard,
+               profiles: Dict[str, FanProfile], profile_name: str = _DEFAULT_FAN_PROFILE,
+               profile_schedule: Optional[FanProfileSchedule] = None,
+               fan_model: Optional[FanEffectivenessModel] = None, auto_apply_lut: bool = False,
+               read_temperature: Callable[[], Optional[float]] = get_pi_temperature,
+               read_load: Callable[[], float] = get_pi_load, *args, **kwargs):
     super().__init__(*args, **kwargs)
     self.argon_daemon = daemon  # XXX use weakref?
     self._argon_board = argon_board
     assert self._argon_board.is_threadsafe
-    self._fan_speed_lut = fan_speed_lut  # Need to guard direct access with mutex
+    self._profiles = profiles
+    self._profile = profiles[profile_name]  # Guarded by _fan_speed_lut_mutex
+    self._profile_schedule = profile_schedule
+    self._prev_scheduled_profile: Optional[str] = None
+    self._fan_speed_lut = self._profile.lut  # Need to guard direct access with mutex
+    self._base_fan_speed_lut = self._profile.lut  # Without auto-tuning; also guarded by mutex
     self._fan_speed_lut_mutex = Lock()
-    self._poll_interval = poll_interval_sec
-    self._hysteresis = hysteresis_sec  # How long to wait before reducing speed
-    self._temperature = get_pi_temperature()
+    self._fan_model = fan_model
+    self._auto_apply_lut = auto_apply_lut
+    self._prev_fan_speed: Optional[int] = None
+    self._poll_interval = self._profile.poll_interval_sec
+    self._hysteresis = self._profile.hysteresis_sec  # How long to wait before reducing speed
+    self._read_temperature = read_temperature
+    self._read_load = read_load
+    self._temperature = read_temperature()
     self._control_enabled = True
+    self._loop_lateness = RunningStats()
+    self._wake_event = Event()  # Interrupts wait between polls
 
   @property
   def temperature(self) -> Optional[float]:
     return self._temperature
 
+  @property
+  def loop_lateness(self) -> RunningStats:
+    # How much later than scheduled each control loop iteration started
+    return self._loop_lateness
+
   @property
   def fan_speed(self) -> Optional[int]:
     return self._argon_board.fan_speed
 
   @fan_speed.setter
   def fan_speed(self, value: int) -> None:
-    self._argon_board.fan_speed = value
+    self.set_fan_speed(value)
+
+  # Returns False if speed could not be set
+  def set_fan_speed(self, value: int) -> bool:
+    success = self._argon_board.set_fan_speed(value)
     # Read fan_speed back, as it's possible it wasn't actually changed
     self.argon_daemon.notify(NOTIFY.VALUE_FAN_SPEED, self._argon_board.fan_speed)
+    return success
 
   @property
   def fan_speed_lut(self) -> LUTItemIterator:
@@ -352,8 +935,81 @@ class FanControlThread(Thread):  # noqa: E302
       lut = StepFunction.from_iterator(lut)
     with self._fan_speed_lut_mutex:
       self._fan_speed_lut = lut
+      self._base_fan_speed_lut = lut
     self.argon_daemon.notify(NOTIFY.EVENT_FAN_SPEED_LUT_CHANGED)
 
+  @property
+  def profile_names(self) -> List[str]:
+    return sorted(self._profiles.keys())
+
+  @property
+  def profile(self) -> str:
+    return self._profile.name
+
+  @profile.setter
+  def profile(self, name: str) -> None:
+    # Profiles are pre-compiled, so switching is just a few assignments
+    if name not in self._profiles:
+      raise ValueError(f"Unknown fan profile {name}")
+    profile = self._profiles[name]
+    with self._fan_speed_lut_mutex:
+      self._profile = profile
+      self._fan_speed_lut = profile.lut
+      self._base_fan_speed_lut = profile.lut
+      self._hysteresis = profile.hysteresis_sec
+      self._poll_interval = profile.poll_interval_sec
+    if self._fan_model is not None:
+      self._fan_model.reset()  # Current poll interval has unknown length
+    log.info("Switched to fan profile %s", name)
+    self.argon_daemon.notify(NOTIFY.VALUE_FAN_PROFILE, name)
+    self.argon_daemon.notify(NOTIFY.EVENT_FAN_SPEED_LUT_CHANGED)
+    self._wake_event.set()  # Poll now, rather than after (possibly long) previous interval
+
+  # Switches profile only when the scheduled profile changes, so that
+  # manual switches stay in effect until the next scheduled time
+  def _check_profile_schedule(self) -> None:
+    scheduled = self._profile_schedule.scheduled_profile(time.localtime())  # type: ignore
+    if scheduled != self._prev_scheduled_profile:
+      self._prev_scheduled_profile = scheduled
+      if scheduled != self.profile:
+        log.info("Scheduled switch to fan profile %s", scheduled)
+        self.argon_daemon.set_fan_profile(scheduled)
+
+  @property
+  def suggested_fan_speed_lut(self) -> Optional[LUTFunction]:
+    if self._fan_model is None:
+      return None
+    with self._fan_speed_lut_mutex:
+      base_lut = self._base_fan_speed_lut
+    return self._fan_model.suggest_lut(base_lut)
+
+  # Replaces current LUT with suggested one (but remembers configured LUT,
+  # so suggestions are always relative to that); returns False if the
+  # current LUT was not changed
+  def apply_suggested_fan_speed_lut(self) -> bool:
+    lut = self.suggested_fan_speed_lut
+    if lut is None:
+      return False
+    with self._fan_speed_lut_mutex:
+      if list(lut.items()) == list(self._fan_speed_lut.items()):
+        return False
+      self._fan_speed_lut = lut
+    log.info("Applied auto-tuned fan speed LUT")
+    self.argon_daemon.notify(NOTIFY.EVENT_FAN_SPEED_LUT_CHANGED)
+    return True
+
+  def _update_fan_model(self, temperature: float) -> None:
+    fan_model: FanEffectivenessModel = self._fan_model  # type: ignore
+    # Speed in effect since last poll is unknown if it was set externally meanwhile
+    fan_speed = self.fan_speed
+    if fan_speed != self._prev_fan_speed:
+      fan_speed = None
+    num_samples = fan_model.num_samples
+    fan_model.update(fan_speed, temperature, self._read_load(), self._poll_interval)
+    if (self._auto_apply_lut and fan_model.num_samples != num_samples and
+        fan_model.num_samples % _AUTOTUNE_APPLY_INTERVAL == 0):
+      self.apply_suggested_fan_speed_lut()
+
   @property
   def control_enabled(self) -> bool:
     return self._control_enabled
@@ -368,27 +1024,135 @@ class FanControlThread(Thread):  # noqa: E302
     self.argon_daemon.notify(NOTIFY.VALUE_FAN_CONTROL_ENABLED, False)
     log.info("Fan control enabled")
 
+  def poll_once(self) -> None:
+    self._temperature = self._read_temperature()
+    if self._temperature is None:
+      log.warn("Failed to read temperature")
+      if self._fan_model is not None:
+        self._fan_model.reset()
+    else:
+      self.argon_daemon.notify(NOTIFY.VALUE_TEMPERATURE, self._temperature)
+      if self._fan_model is not None:
+        self._update_fan_model(self._temperature)
+      if self._control_enabled:
+        with self._fan_speed_lut_mutex:
+          speed = round(self._fan_speed_lut(self._temperature))
+        if speed != self.fan_speed:
+          log.info("Adjusting fan speed to %d for temperature %.1f", speed, self._temperature)
+          self.fan_speed = speed
+          # TODO - Implement hysteresis (hysteresis_sec is accepted, but has no effect yet)
+    self._prev_fan_speed = self.fan_speed
+
   def run(self) -> None:
     log.info("Fan control and temperature monitoring thread starting")
     self._stop_requested = False
+    scheduled_time = None
     while not self._stop_requested:
-      self._temperature = get_pi_temperature()
-      if self._temperature is None:
-        log.warn("Failed to read temperature")
-      else:
-        self.argon_daemon.notify(NOTIFY.VALUE_TEMPERATURE, self._temperature)
-        if self._control_enabled:
-          with self._fan_speed_lut_mutex:
-            speed = round(self._fan_speed_lut(self._temperature))
-          if speed != self.fan_speed:
-            log.info(f"Adjusting fan speed to {speed} for temperature {self._temperature}")
-            self.fan_speed = speed
-            # TODO - Implement hysteresis
-      time.sleep(self._poll_interval)
+      start_time = time.monotonic()
+      if scheduled_time is not None:
+        self._loop_lateness.update(max(start_time - scheduled_time, 0.0))
+      poll_interval = self._poll_interval  # Profile switch could change it mid-iteration
+      self.argon_daemon.heartbeat('fan_control', poll_interval)
+      if self._profile_schedule is not None:
+        self._check_profile_schedule()
+      self._wake_event.clear()  # After scheduled switches, which will be in effect for this poll
+      self.poll_once()
+      scheduled_time = start_time + poll_interval
+      self._wake_event.wait(poll_interval)
     log.info("Fan control and temperature monitoring thread exiting")
 
   def stop(self) -> None:
     self._stop_requested = True
+    self._wake_event.set()
+
+
+############################################################################
+# Stall detection and systemd watchdog
+
+def _sd_notify(state: str) -> bool:
+  # Minimal sd_notify(3); returns False if not running under systemd (or on error)
+  address = os.environ.get('NOTIFY_SOCKET')
+  if not address:
+    return False
+  if address.startswith('@'):
+    address = '\0' + address[1:]  # Abstract namespace socket
+  try:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+      sock.sendto(state.encode(), address)
+    return True
+  except OSError as exc:
+    log.warning("Failed to notify systemd: %s", exc)
+    return False
+
+
+# Point-of-authority for daemon health.
+# Tracks per-subsystem heartbeats; pings the systemd watchdog only while all
+# subsystems are healthy, and sets fan to failsafe speed if fan control stalls.
+class WatchdogThread(Thread):
+  def __init__(self, daemon: 'ArgonDaemon', failsafe_speed: int = _WATCHDOG_FAILSAFE_SPEED,
+               stall_factor: float = _WATCHDOG_STALL_FACTOR, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.argon_daemon = daemon  # XXX use weakref?
+    self._failsafe_speed = failsafe_speed
+    self._stall_factor = stall_factor
+    self._deadlines: Dict[str, float] = {}  # subsystem name -> monotonic time by which next heartbeat is due
+    self._stalled: Dict[str, bool] = {}
+    self._stall_counts: Dict[str, int] = {}
+    self._mutex = Lock()
+    self._stop_event = Event()
+    watchdog_usec = int(os.environ.get('WATCHDOG_USEC', '0'))
+    self._systemd_enabled = watchdog_usec > 0
+    # systemd recommends pinging at half the watchdog interval
+    self._check_interval = watchdog_usec / 2e6 if self._systemd_enabled else _WATCHDOG_CHECK_INTERVAL_SEC
+
+  # interval_sec is the nominal time until next heartbeat
+  def heartbeat(self, name: str, interval_sec: float) -> None:
+    with self._mutex:
+      self._deadlines[name] = time.monotonic() + self._stall_factor * interval_sec
+
+  @property
+  def stall_counts(self) -> Dict[str, int]:
+    with self._mutex:
+      return dict(self._stall_counts)
+
+  # Seconds until each subsystem's heartbeat is due (negative if overdue)
+  @property
+  def heartbeat_slack(self) -> Dict[str, float]:
+    now = time.monotonic()
+    with self._mutex:
+      return {name: deadline - now for name, deadline in self._deadlines.items()}
+
+  def _check(self) -> bool:
+    healthy = True
+    for name, slack in self.heartbeat_slack.items():
+      stalled = slack < 0
+      healthy = healthy and not stalled
+      if stalled and not self._stalled.get(name, False):
+        log.error("Subsystem %s stalled (heartbeat overdue by %.1f sec)", name, -slack)
+        with self._mutex:
+          self._stall_counts[name] = self._stall_counts.get(name, 0) + 1
+        if name == 'fan_control':
+          self._apply_failsafe()
+      elif not stalled and self._stalled.get(name, False):
+        log.warning("Subsystem %s recovered", name)
+      self._stalled[name] = stalled
+    return healthy
+
+  def _apply_failsafe(self) -> None:
+    if self.argon_daemon.force_fan_speed(self._failsafe_speed):
+      log.error("Fan set to failsafe speed %d", self._failsafe_speed)
+    else:
+      log.critical("Failed to set fan to failsafe speed; I2C bus appears hung")
+
+  def run(self) -> None:
+    log.info("Watchdog thread starting (systemd watchdog %s)", "enabled" if self._systemd_enabled else "disabled")
+    while not self._stop_event.wait(self._check_interval):
+      if self._check() and self._systemd_enabled:
+        _sd_notify('WATCHDOG=1')
+    log.info("Watchdog thread exiting")
+
+  def stop(self) -> None:
+    self._stop_event.set()
 
 
 ############################################################################
@@ -398,74 +1162,194 @@ class ArgonOneException(dbus.DBusException):
   _dbus_error_name = 'net.clusterhack.ArgonOneException'
 
 
+# Invoked via GLib.idle_add; returns False so it only runs once
+def _idle_call_once(func: Callable, *args) -> bool:
+  func(*args)
+  return False
+
+
 # XXX python-dbus does not like type annotations
 class ArgonOne(dbus.service.Object):
-  def __init__(self, conn, daemon: 'ArgonDaemon', object_path: str = '/net/clusterhack/ArgonOne'):
+  def __init__(self, conn, daemon: 'ArgonDaemon', executor: ThreadPoolExecutor,
+               object_path: str = '/net/clusterhack/ArgonOne'):
     super().__init__(conn, object_path)
     self.argon_daemon = daemon
+    self._executor = executor
+
+  # Runs func on the worker executor, so that slow operations (e.g., I2C writes,
+  # or waiting for the daemon to finish starting) do not stall the GLib main
+  # loop.  D-Bus reply (with func's return value, if any) or error is sent from
+  # the main loop once func completes.
+  def _run_async(self, reply_cb, error_cb, func: Callable, *args) -> None:
+    def _done(future: Future) -> None:
+      exc = future.exception()
+      if exc is None:
+        result = future.result()
+        GLib.idle_add(_idle_call_once, reply_cb, *(() if result is None else (result,)))
+      else:
+        if not isinstance(exc, dbus.DBusException):
+          exc = ArgonOneException(f"{func.__name__} failed: {str(exc)}")
+        GLib.idle_add(_idle_call_once, error_cb, exc)
+    self._executor.submit(func, *args).add_done_callback(_done)
+
+  # Reads a daemon property on the worker executor (see _run_async)
+  def _get_async(self, reply_cb, error_cb, name: str) -> None:
+    def _get():
+      try:
+        return getattr(self.argon_daemon, name)
+      except Exception as exc:
+        raise ArgonOneException(f"Failed to get {name}: {str(exc)}")
+    self._run_async(reply_cb, error_cb, _get)
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='', out_signature='i')
-  def GetFanSpeed(self):
-    return self.argon_daemon.fan_speed
+                       in_signature='', out_signature='i',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetFanSpeed(self, reply_cb, error_cb):
+    self._get_async(reply_cb, error_cb, 'fan_speed')
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='i', out_signature='')
-  def SetFanSpeed(self, speed: int):
-    self.argon_daemon.fan_speed = speed
+                       in_signature='i', out_signature='',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def SetFanSpeed(self, speed: int, reply_cb, error_cb):
+    self._run_async(reply_cb, error_cb, self._set_fan_speed, int(speed))
+
+  def _set_fan_speed(self, speed: int) -> None:
+    if not self.argon_daemon.set_fan_speed(speed):
+      raise ArgonOneException(f"Failed to set fan speed to {speed} (I2C write failed)")
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='', out_signature='d')
-  def GetTemperature(self):
-    return self.argon_daemon.temperature
+                       in_signature='', out_signature='d',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetTemperature(self, reply_cb, error_cb):
+    self._get_async(reply_cb, error_cb, 'temperature')
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='', out_signature='b')
-  def GetFanControlEnabled(self):
-    return self.argon_daemon.fan_control_enabled
+                       in_signature='', out_signature='b',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetFanControlEnabled(self, reply_cb, error_cb):
+    self._get_async(reply_cb, error_cb, 'fan_control_enabled')
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='b', out_signature='')
-  def SetFanControlEnabled(self, enable):
+                       in_signature='b', out_signature='',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def SetFanControlEnabled(self, enable, reply_cb, error_cb):
+    self._run_async(reply_cb, error_cb, self._set_fan_control_enabled, bool(enable))
+
+  def _set_fan_control_enabled(self, enable: bool) -> None:
     if enable:
       self.argon_daemon.enable_fan_control()
     else:
       self.argon_daemon.disable_fan_control()
 
-  @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='', out_signature='a(dd)')
-  def GetFanSpeedLUT(self):
-    lut_list = list(self.argon_daemon.fan_speed_lut)
+  @staticmethod
+  def _lut_to_dbus(lut_iter: LUTItemIterator) -> List[Tuple[float, int]]:
+    lut_list = list(lut_iter)
     # None doesn't match D-Bus return signature, so replace with -1
     assert lut_list[0][0] is None
     lut_list[0] = (-1, lut_list[0][1])
-    return lut_list
+    return lut_list  # type: ignore
+
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='', out_signature='a(dd)',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetFanSpeedLUT(self, reply_cb, error_cb):
+    self._run_async(reply_cb, error_cb, self._get_fan_speed_lut)
+
+  def _get_fan_speed_lut(self) -> List[Tuple[float, int]]:
+    return self._lut_to_dbus(self.argon_daemon.fan_speed_lut)
+
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='', out_signature='a(dd)',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetSuggestedFanSpeedLUT(self, reply_cb, error_cb):
+    self._run_async(reply_cb, error_cb, self._get_suggested_fan_speed_lut)
+
+  def _get_suggested_fan_speed_lut(self) -> List[Tuple[float, int]]:
+    lut = self.argon_daemon.suggested_fan_speed_lut
+    if lut is None:
+      raise ArgonOneException("No LUT suggestion available (auto-tune disabled or not enough data yet)")
+    return self._lut_to_dbus(lut)
+
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='', out_signature='b',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def ApplySuggestedFanSpeedLUT(self, reply_cb, error_cb):
+    self._run_async(reply_cb, error_cb, self.argon_daemon.apply_suggested_fan_speed_lut)
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='a(dd)', out_signature='')
-  def SetFanSpeedLUT(self, lut_pairs):
+                       in_signature='a(dd)', out_signature='',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def SetFanSpeedLUT(self, lut_pairs, reply_cb, error_cb):
+    # Copy out of D-Bus types before handing off to worker
+    lut_pairs = [(float(x), float(y)) for x, y in lut_pairs]
+    self._run_async(reply_cb, error_cb, self._set_fan_speed_lut, lut_pairs)
+
+  def _set_fan_speed_lut(self, lut_pairs: List[Tuple[float, float]]) -> None:
     if len(lut_pairs) < 1 or lut_pairs[0][0] != -1:
       raise ArgonOneException("First LUT entry must be default value, with threshold of -1")
-    lut_pairs[0][0] = None  # Couldn't do None with a clean D-Bus signature
+    # Couldn't do None with a clean D-Bus signature
+    lut_iter = [(None, lut_pairs[0][1])] + lut_pairs[1:]
     try:
-      lut = StepFunction.from_iterator(lut_pairs)
+      lut = StepFunction.from_iterator(lut_iter)  # type: ignore
     except ValueError as exc:
       raise ArgonOneException(f"Failed to parse LUT: {str(exc)}")
     self.argon_daemon.fan_speed_lut = lut
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='', out_signature='b')
-  def GetPowerControlEnabled(self):
-    return self.argon_daemon.power_control_enabled
+                       in_signature='', out_signature='as')
+  def GetProfiles(self):
+    return self.argon_daemon.fan_profiles
+
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='', out_signature='s',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetProfile(self, reply_cb, error_cb):
+    self._get_async(reply_cb, error_cb, 'fan_profile')
+
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='s', out_signature='',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def SetProfile(self, name, reply_cb, error_cb):
+    self._run_async(reply_cb, error_cb, self._set_profile, str(name))
+
+  def _set_profile(self, name: str) -> None:
+    try:
+      self.argon_daemon.set_fan_profile(name)
+    except ValueError as exc:
+      raise ArgonOneException(str(exc))
+
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='', out_signature='b',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetPowerControlEnabled(self, reply_cb, error_cb):
+    self._get_async(reply_cb, error_cb, 'power_control_enabled')
 
   @dbus.service.method("net.clusterhack.ArgonOne",
-                       in_signature='b', out_signature='')
-  def SetPowerControlEnabled(self, enable):
+                       in_signature='b', out_signature='',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def SetPowerControlEnabled(self, enable, reply_cb, error_cb):
+    self._run_async(reply_cb, error_cb, self._set_power_control_enabled, bool(enable))
+
+  def _set_power_control_enabled(self, enable: bool) -> None:
     if enable:
       self.argon_daemon.enable_power_control()
     else:
       self.argon_daemon.disable_power_control()
 
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='', out_signature='a{sd}',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetWatchdogStats(self, reply_cb, error_cb):
+    self._get_async(reply_cb, error_cb, 'watchdog_stats')
+
+  # Waits (on worker) for daemon to finish starting, so clients calling this as
+  # soon as the bus name appears get a complete snapshot rather than an error
+  @dbus.service.method("net.clusterhack.ArgonOne",
+                       in_signature='', out_signature='a{sv}',
+                       async_callbacks=('reply_cb', 'error_cb'))
+  def GetStatus(self, reply_cb, error_cb):
+    self._get_async(reply_cb, error_cb, 'status')
+
   @dbus.service.method("net.clusterhack.ArgonOne",
                        in_signature='', out_signature='')
   def Shutdown(self):
@@ -488,8 +1372,10 @@ class DBusServerThread(Thread):
     super().__init__(*args, **kwargs)
     self.argon_daemon = daemon  # XXX use weakref?
     self.argon_obj = None
+    self.mainloop = GLib.MainLoop()
+    self.ready = Event()  # Set once bus name is claimed and main loop is running
 
-  def notify(self, notify_type: NOTIFY, value: Optional[Union[bool, int, str]] = None) -> None:
+  def notify(self, notify_type: NOTIFY, value: Optional[Union[bool, float, int, str]] = None) -> None:
     if self.argon_obj is None:
       return
     if value is not None:
@@ -501,122 +1387,424 @@ class DBusServerThread(Thread):
     log.info("D-Bus server initialization")
     dbus_loop = dbus.mainloop.glib.DBusGMainLoop()
     system_bus = dbus.SystemBus(mainloop=dbus_loop)
+    # Single worker, so that async method calls are still serialized (in arrival order)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='argonone-dbus-worker')
     try:
       name = dbus.service.BusName("net.clusterhack.ArgonOne", system_bus)  # noqa: F841
-      self.argon_obj = ArgonOne(system_bus, self.argon_daemon)
-      self.mainloop = GLib.MainLoop()
+      self.argon_obj = ArgonOne(system_bus, self.argon_daemon, executor)
+      GLib.idle_add(_idle_call_once, self.ready.set)
+      self._heartbeat()
+      GLib.timeout_add_seconds(_DBUS_HEARTBEAT_SEC, self._heartbeat)
       log.info("D-Bus server thread starting")
       self.mainloop.run()
     finally:
+      executor.shutdown(wait=True)
       system_bus.close()
     log.info("D-Bus server thread exiting")
 
+  def _heartbeat(self) -> bool:
+    # Runs on main loop, so it also detects a wedged loop
+    self.argon_daemon.heartbeat('dbus', _DBUS_HEARTBEAT_SEC)
+    return True  # Keep timeout source
+
   def stop(self) -> None:
-    self.mainloop.quit()  # XXX - use GLib.idle_add ?
+    # Via main loop, so that this also works if called before loop is running
+    GLib.idle_add(_idle_call_once, self.mainloop.quit)
+
+
+def _config_cache_path() -> str:
+  # systemd sets CACHE_DIRECTORY when the unit specifies CacheDirectory=
+  cache_dir = os.environ.get('CACHE_DIRECTORY')
+  if cache_dir is None:
+    cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'argonone')
+  return os.path.join(cache_dir, _CONFIG_CACHE_FILENAME)
 
 
 # Coordinates the three types of monitor & control threads,
 # delegating requests accordingly.
 class ArgonDaemon:
   @staticmethod
-  def load_config() -> Optional[dict]:
-    config = None
+  def find_config() -> str:
     for config_location in _CONFIG_LOCATIONS:
       config_path = os.path.expandvars(config_location)
       if os.path.isfile(config_path):
-        log.info(f"Loading config file from {config_path}")
-        with open(config_path, 'r') as fp:
-          config = yaml.load(fp)
-        break
-    if config is None:
-      raise RuntimeError("No configuration file found!")
-    return config  # type: ignore
+        return config_path
+    raise RuntimeError("No configuration file found!")
 
-  def __init__(self):
-    # Load configuration and extract relevant parameters
-    config_yaml = self.load_config()
+  @staticmethod
+  def load_config(config_path: Optional[str] = None) -> dict:
+    if config_path is None:
+      config_path = ArgonDaemon.find_config()
+    log.info("Loading config file from %s", config_path)
+    with open(config_path, 'r') as fp:
+      config = yaml.load(fp, Loader=_YAMLLoader)
+    if not isinstance(config, dict):
+      raise RuntimeError(f"Malformed configuration file {config_path}")
+    return config
+
+  # Validates configuration and converts it into ready-to-use objects.
+  # Result must be picklable, since it is cached (see load_compiled_config)
+  @staticmethod
+  def compile_config(config_yaml: dict) -> dict:
     power_config = config_yaml['power_button']
     fan_config = config_yaml['fan_control']
-    # Initialize members
-    self._argon_board = ArgonOneBoard(initial_speed=0, bus_mutex=Lock())
-    fan_lut = StepFunction.from_config_lut(fan_config['speed_lut'])
-    hysteresis = fan_config.get('hysteresis_sec', 30.0)
-    poll_interval = fan_config.get('poll_interval_sec', 10.0)
-    fan_control_enabled = fan_config.get('enabled', True)
-    self._fan_control_thread = FanControlThread(self, self._argon_board, fan_lut, hysteresis, poll_interval)
-    if not fan_control_enabled:
-      self._fan_control_thread.pause_control()
-    reboot_cmd = power_config.get('reboot_cmd', 'sudo reboot')
-    shutdown_cmd = power_config.get('shutdown_cmd', 'sudo shutdown -h now')
-    power_control_enabled = power_config.get('enabled', True)
-    self._power_control_thread = PowerControlThread(self, self._argon_board, reboot_cmd, shutdown_cmd)
-    if not power_control_enabled:
-      self._power_control_thread.disable_control()
+    watchdog_config = config_yaml.get('watchdog') or {}
+    if float(watchdog_config.get('stall_factor', _WATCHDOG_STALL_FACTOR)) <= 1:
+      raise ValueError("Watchdog stall_factor must be greater than 1")
+    shutdown_deadline_sec = float(power_config.get('shutdown_deadline_sec', _SHUTDOWN_DEADLINE_SEC))
+    shutdown_reserve_sec = float(power_config.get('shutdown_reserve_sec', _SHUTDOWN_RESERVE_SEC))
+    if shutdown_deadline_sec <= 0:
+      raise ValueError("Shutdown deadline must be positive")
+    if not (0 <= shutdown_reserve_sec < shutdown_deadline_sec):
+      raise ValueError("Shutdown reserve must be non-negative and less than deadline")
+    fan_profiles = ArgonDaemon._compile_fan_profiles(fan_config)
+    fan_profile = str(fan_config.get('profile', _DEFAULT_FAN_PROFILE))
+    fan_profile_schedule = None
+    if fan_config.get('profile_schedule'):
+      fan_profile_schedule = FanProfileSchedule.from_config(fan_config['profile_schedule'])
+    for name in [fan_profile] + (fan_profile_schedule.profile_names if fan_profile_schedule else []):
+      if name not in fan_profiles:
+        raise ValueError(f"Unknown fan profile {name}")
+    return {
+      'fan_profiles': fan_profiles,
+      'fan_profile': fan_profile,
+      'fan_profile_schedule': fan_profile_schedule,
+      'fan_control_enabled': bool(fan_config.get('enabled', True)),
+      'auto_tune': ArgonDaemon._compile_auto_tune_config(fan_config.get('auto_tune', {})),
+      'reboot_cmd': power_config.get('reboot_cmd', 'sudo reboot'),
+      'shutdown_cmd': power_config.get('shutdown_cmd', 'sudo shutdown -h now'),
+      'shutdown_hooks': [ShutdownHook.from_config(h) for h in power_config.get('pre_shutdown_hooks', [])],
+      'shutdown_deadline_sec': shutdown_deadline_sec,
+      'shutdown_reserve_sec': shutdown_reserve_sec,
+      'power_control_enabled': bool(power_config.get('enabled', True)),
+      'trace_path': (config_yaml.get('trace') or {}).get('path'),
+      'watchdog_failsafe_speed': int(watchdog_config.get('failsafe_speed', _WATCHDOG_FAILSAFE_SPEED)),
+      'watchdog_stall_factor': float(watchdog_config.get('stall_factor', _WATCHDOG_STALL_FACTOR)),
+    }
+
+  @staticmethod
+  def _compile_fan_profiles(fan_config: dict) -> Dict[str, FanProfile]:
+    # Top-level settings define the default profile, and are defaults for all other profiles
+    hysteresis = float(fan_config.get('hysteresis_sec', 30.0))
+    poll_interval = float(fan_config.get('poll_interval_sec', 10.0))
+    profiles = {
+      _DEFAULT_FAN_PROFILE: FanProfile.from_config(_DEFAULT_FAN_PROFILE, fan_config, hysteresis, poll_interval),
+    }
+    for name, profile_config in (fan_config.get('profiles') or {}).items():
+      name = str(name)
+      if name in profiles:
+        raise ValueError(f"Fan profile name {name} is reserved")
+      profiles[name] = FanProfile.from_config(name, profile_config, hysteresis, poll_interval)
+    return profiles
+
+  @staticmethod
+  def _compile_auto_tune_config(auto_tune_config: dict) -> dict:
+    compiled = {
+      'enabled': bool(auto_tune_config.get('enabled', False)),
+      'apply': bool(auto_tune_config.get('apply', False)),
+      'tolerance_c_per_min': float(auto_tune_config.get('tolerance_c_per_min', 0.5)),
+      'min_samples': int(auto_tune_config.get('min_samples', 30)),
+      'min_speed': int(auto_tune_config.get('min_speed', 50)),
+      'safety_temp': float(auto_tune_config.get('safety_temp', 60.0)),
+    }
+    # Validate now, rather than when subsystems are initialized
+    FanEffectivenessModel(compiled['tolerance_c_per_min'], compiled['min_samples'],
+                          compiled['min_speed'], compiled['safety_temp'])
+    return compiled
+
+  # Returns compiled configuration, avoiding YAML parsing if a cached copy
+  # exists for the same (path, mtime, size) of the config file
+  @staticmethod
+  def load_compiled_config() -> dict:
+    config_path = ArgonDaemon.find_config()
+    stat = os.stat(config_path)
+    cache_key = (_CONFIG_CACHE_VERSION, config_path, stat.st_mtime_ns, stat.st_size)
+    cache_path = _config_cache_path()
+    try:
+      with open(cache_path, 'rb') as fp:
+        cached_key, config = pickle.load(fp)
+      if cached_key == cache_key:
+        log.info("Using cached config for %s", config_path)
+        return config  # type: ignore
+    except Exception:  # Missing or unreadable cache; any failure just means a miss
+      pass
+    config = ArgonDaemon.compile_config(ArgonDaemon.load_config(config_path))
+    try:
+      os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+      tmp_path = cache_path + '.tmp'
+      with open(tmp_path, 'wb') as fp:
+        pickle.dump((cache_key, config), fp)
+      os.replace(tmp_path, cache_path)
+    except OSError as exc:
+      log.info("Could not write config cache %s: %s", cache_path, exc)
+    return config
+
+  def __init__(self, config: Optional[dict] = None):
+    self._start_time = time.monotonic()
+    # Only load configuration here; hardware and control threads are
+    # initialized by start(), after D-Bus name has been claimed
+    self._config = config if config is not None else self.load_compiled_config()
+    self._log_startup("config loaded")
+    self._recorder: Optional[TraceRecorder] = None
+    self._argon_board: Optional[ArgonOneBoard] = None
+    self._fan_control_thread: Optional[FanControlThread] = None
+    self._power_control_thread: Optional[PowerControlThread] = None
+    self._watchdog_thread: Optional[WatchdogThread] = None
+    self._subsystems_ready = Event()
     self._dbus_thread = DBusServerThread(self)
 
+  def _log_startup(self, stage: str) -> None:
+    log.info("Startup: %s after %.1f msec", stage, 1000 * (time.monotonic() - self._start_time))
+
+  # Hardware and system interaction points; overridden for trace replay
+
+  def _create_board(self) -> ArgonOneBoard:
+    if self._config['trace_path'] is not None:
+      log.info("Recording hardware trace to %s", self._config['trace_path'])
+      self._recorder = TraceRecorder(self._config['trace_path'])
+      return RecordingArgonOneBoard(self._recorder, initial_speed=0, bus_mutex=Lock())
+    return ArgonOneBoard(initial_speed=0, bus_mutex=Lock())
+
+  def _create_shutdown_orchestrator(self) -> ShutdownOrchestrator:
+    config = self._config
+    return ShutdownOrchestrator(config['shutdown_cmd'], config['shutdown_hooks'],
+                                config['shutdown_deadline_sec'], config['shutdown_reserve_sec'])
+
+  def _record(self, event: TRACE_EVENT, value: Optional[float]) -> None:
+    if self._recorder is not None:
+      self._recorder.record(event, value)
+
+  def _read_temperature(self) -> Optional[float]:
+    temperature = get_pi_temperature()
+    self._record(TRACE_EVENT.TEMPERATURE, temperature)
+    return temperature
+
+  def _read_load(self) -> float:
+    load = get_pi_load()
+    self._record(TRACE_EVENT.LOAD, load)
+    return load
+
+  def _run_command(self, cmdargs: List[str]) -> None:
+    subprocess.run(cmdargs)
+
+  def _init_subsystems(self) -> None:
+    config = self._config
+    self._argon_board = self._create_board()
+    auto_tune = config['auto_tune']
+    fan_model = None
+    if auto_tune['enabled']:
+      fan_model = FanEffectivenessModel(auto_tune['tolerance_c_per_min'], auto_tune['min_samples'],
+                                        auto_tune['min_speed'], auto_tune['safety_temp'])
+    self._fan_control_thread = FanControlThread(self, self._argon_board, config['fan_profiles'],
+                                                config['fan_profile'], config['fan_profile_schedule'],
+                                                fan_model, auto_tune['apply'],
+                                                self._read_temperature, self._read_load)
+    if not config['fan_control_enabled']:
+      self._fan_control_thread.disable_control()
+    self._power_control_thread = PowerControlThread(self, self._argon_board, config['reboot_cmd'],
+                                                    self._create_shutdown_orchestrator(), self._run_command)
+    if not config['power_control_enabled']:
+      self._power_control_thread.disable_control()
+
+  @property
+  def ready(self) -> bool:
+    return self._subsystems_ready.is_set()
+
+  # Blocks callers (e.g., async D-Bus requests arriving early) until start()
+  # has initialized hardware and control threads
+  def _wait_ready(self) -> None:
+    if not self._subsystems_ready.wait(_SUBSYSTEM_READY_TIMEOUT_SEC):
+      raise RuntimeError("Daemon subsystems not initialized")
+
   @property
   def fan_speed(self) -> Optional[int]:
+    self._wait_ready()
     return self._fan_control_thread.fan_speed  # type: ignore
 
   @fan_speed.setter
   def fan_speed(self, value: int) -> None:
-    self._fan_control_thread.fan_speed = value
+    self.set_fan_speed(value)
+
+  # Returns False if speed could not be set (e.g., I2C write failed)
+  def set_fan_speed(self, value: int) -> bool:
+    self._wait_ready()
+    self._record(TRACE_EVENT.FAN_SET, value)
+    return self._fan_control_thread.set_fan_speed(value)  # type: ignore
 
   @property
   def temperature(self) -> Optional[float]:
+    self._wait_ready()
     return self._fan_control_thread.temperature  # type: ignore
 
   @property
   def fan_control_enabled(self) -> bool:
+    self._wait_ready()
     return self._fan_control_thread.control_enabled  # type: ignore
 
   def disable_fan_control(self) -> None:
-    self._fan_control_thread.disable_control()
+    self._wait_ready()
+    self._record(TRACE_EVENT.FAN_CONTROL, 0)
+    self._fan_control_thread.disable_control()  # type: ignore
 
   def enable_fan_control(self) -> None:
-    self._fan_control_thread.enable_control()
+    self._wait_ready()
+    self._record(TRACE_EVENT.FAN_CONTROL, 1)
+    self._fan_control_thread.enable_control()  # type: ignore
 
   @property
   def fan_speed_lut(self) -> LUTItemIterator:
+    self._wait_ready()
     return self._fan_control_thread.fan_speed_lut  # type: ignore
 
   @fan_speed_lut.setter
   def fan_speed_lut(self, lut: Union[LUTFunction, LUTItemIterator]) -> None:
-    self._fan_control_thread.fan_speed_lut = lut
+    self._wait_ready()
+    self._record(TRACE_EVENT.LUT_SET, None)
+    self._fan_control_thread.fan_speed_lut = lut  # type: ignore
+
+  @property
+  def suggested_fan_speed_lut(self) -> Optional[LUTItemIterator]:
+    self._wait_ready()
+    lut = self._fan_control_thread.suggested_fan_speed_lut  # type: ignore
+    return lut.items() if lut is not None else None
+
+  def apply_suggested_fan_speed_lut(self) -> bool:
+    self._wait_ready()
+    self._record(TRACE_EVENT.LUT_APPLY_SUGGESTED, None)
+    return self._fan_control_thread.apply_suggested_fan_speed_lut()  # type: ignore
+
+  @property
+  def fan_profiles(self) -> List[str]:
+    return sorted(self._config['fan_profiles'].keys())
+
+  @property
+  def fan_profile(self) -> str:
+    self._wait_ready()
+    return self._fan_control_thread.profile  # type: ignore
+
+  def set_fan_profile(self, name: str) -> None:
+    self._wait_ready()
+    if name in self._config['fan_profiles']:
+      self._record(TRACE_EVENT.FAN_PROFILE, self.fan_profiles.index(name))
+    self._fan_control_thread.profile = name  # type: ignore
+
+  # Sets fan speed bypassing fan control thread (which may be stalled), for
+  # watchdog; returns False if I2C bus could not be used in reasonable time
+  def force_fan_speed(self, value: int) -> bool:
+    value = int(max(min(value, 100), 0))
+    if not self._argon_board.force_fan_speed(value, _WATCHDOG_BUS_TIMEOUT_SEC):  # type: ignore
+      return False
+    self._record(TRACE_EVENT.FAN_FAILSAFE, value)
+    self.notify(NOTIFY.VALUE_FAN_SPEED, value)
+    return True
+
+  def heartbeat(self, name: str, interval_sec: float) -> None:
+    if self._watchdog_thread is not None:
+      self._watchdog_thread.heartbeat(name, interval_sec)
+
+  @property
+  def watchdog_stats(self) -> Dict[str, float]:
+    self._wait_ready()
+    lateness = self._fan_control_thread.loop_lateness  # type: ignore
+    stats = {
+      'fan_loop_count': float(lateness.count),
+      'fan_loop_lateness_mean_sec': lateness.mean,
+      'fan_loop_lateness_max_sec': lateness.max,
+      'fan_loop_lateness_last_sec': lateness.last,
+    }
+    if self._watchdog_thread is not None:
+      for name, slack in self._watchdog_thread.heartbeat_slack.items():
+        stats[f'{name}_heartbeat_slack_sec'] = slack
+      for name, count in self._watchdog_thread.stall_counts.items():
+        stats[f'{name}_stalls'] = float(count)
+    return stats
+
+  # Snapshot of all current values, keyed by NOTIFY value names
+  # (omitting any values that are not yet known)
+  @property
+  def status(self) -> Dict[str, Union[bool, float, int, str]]:
+    self._wait_ready()
+    values = [
+      (NOTIFY.VALUE_TEMPERATURE, self.temperature),
+      (NOTIFY.VALUE_FAN_SPEED, self.fan_speed),
+      (NOTIFY.VALUE_FAN_CONTROL_ENABLED, self.fan_control_enabled),
+      (NOTIFY.VALUE_POWER_CONTROL_ENABLED, self.power_control_enabled),
+      (NOTIFY.VALUE_FAN_PROFILE, self.fan_profile),
+    ]
+    return {notify_type.value: value for notify_type, value in values if value is not None}
 
   @property
   def power_control_enabled(self) -> bool:
+    self._wait_ready()
     return self._power_control_thread.control_enabled  # type: ignore
 
   def disable_power_control(self) -> None:
-    self._power_control_thread.disable_control()
+    self._wait_ready()
+    self._record(TRACE_EVENT.POWER_CONTROL, 0)
+    self._power_control_thread.disable_control()  # type: ignore
 
   def enable_power_control(self) -> None:
-    self._power_control_thread.enable_control()
+    self._wait_ready()
+    self._record(TRACE_EVENT.POWER_CONTROL, 1)
+    self._power_control_thread.enable_control()  # type: ignore
 
-  def notify(self, notify_type: NOTIFY, value: Optional[Union[bool, float, int]] = None) -> None:
+  def notify(self, notify_type: NOTIFY, value: Optional[Union[bool, float, int, str]] = None) -> None:
+    self._record(TRACE_EVENT.NOTIFY, list(NOTIFY).index(notify_type))
     self._dbus_thread.notify(notify_type, value)
 
   def start(self) -> None:
     log.info("Daemon starting")
+    # Claim D-Bus name first, so that clients can connect ASAP
     self._dbus_thread.start()
-    self._power_control_thread.start()
-    self._fan_control_thread.start()
+    if self._dbus_thread.ready.wait(_DBUS_READY_TIMEOUT_SEC):
+      self._log_startup("D-Bus service ready")
+    else:
+      log.warning("D-Bus service not ready; starting fan and power control anyway")
+    try:
+      self._init_subsystems()
+      # Start watchdog first, so it sees the first heartbeat of each thread
+      self._watchdog_thread = WatchdogThread(self, self._config['watchdog_failsafe_speed'],
+                                             self._config['watchdog_stall_factor'])
+      self._watchdog_thread.start()
+      self._power_control_thread.start()  # type: ignore
+      self._fan_control_thread.start()  # type: ignore
+    except BaseException:
+      # Otherwise D-Bus thread would keep process alive (holding bus name, but
+      # unable to serve requests), and systemd would never restart it
+      log.error("Daemon startup failed, stopping")
+      self.stop()
+      self._dbus_thread.join()
+      raise
+    self._subsystems_ready.set()
+    self._log_startup("control threads started")
+    _sd_notify('READY=1')
 
   def stop(self) -> None:
     log.info("Daemon stopping")
+    _sd_notify('STOPPING=1')
     # Stop in reverse start order
-    self._fan_control_thread.stop()
-    self._power_control_thread.stop()
+    if self._fan_control_thread is not None:
+      self._fan_control_thread.stop()
+    if self._power_control_thread is not None:
+      self._power_control_thread.stop()
+    if self._watchdog_thread is not None:
+      self._watchdog_thread.stop()
     self._dbus_thread.stop()
 
   def wait(self) -> None:
-    self._fan_control_thread.join()
-    self._power_control_thread.join()
+    if self._fan_control_thread is not None:
+      self._fan_control_thread.join()
+    if self._power_control_thread is not None:
+      self._power_control_thread.join()
+    if self._watchdog_thread is not None:
+      self._watchdog_thread.join()
     self._dbus_thread.join()
 
   def close(self) -> None:
-    self._argon_board.close()
+    if self._argon_board is not None:
+      self._argon_board.close()
+    if self._recorder is not None:
+      self._recorder.close()
 
 
 @contextmanager
@@ -6,7 +6,7 @@
 # WITHOUT WARRANTY OF ANY KIND, either express or implied.
 
 import sys
-from . import ArgonOneBoard, ArgonDaemon, dbus_proxy
+from . import ArgonOneBoard, ArgonDaemon, dbus_proxy, setup_async_logging
 
 from typing import Any, Optional, Union, Callable, Sequence, Dict
 
@@ -83,9 +83,20 @@ def _enabled_fmt(val) -> str:
 def _lut_fmt(pairs) -> str:  # noqa: E302
   return '\n'.join(f"{x if x != -1 else 'default'}: {int(y)}" for x, y in pairs)
 
+def _list_fmt(items) -> str:  # noqa: E302
+  return '\n'.join(str(item) for item in items)
+
+def _applied_fmt(val) -> str:  # noqa: E302
+  return 'applied' if val else 'unchanged'
+
+def _status_fmt(status) -> str:  # noqa: E302
+  return '\n'.join(f"{name}: {value}" for name, value in status.items())
+
 # Dictionary values are either _CmdInfo or strings.  A string value
 # denotes an alias and should be equal to another key of the dictionary.
 _argonctl_cmds: Dict[str, Union[str, _CmdInfo]] = {  # noqa: E305
+  'status': _CmdInfo('GetStatus', None, _status_fmt),
+
   'temp': _CmdInfo('GetTemperature'),
   'temperature': 'temp',
 
@@ -102,6 +113,15 @@ _argonctl_cmds: Dict[str, Union[str, _CmdInfo]] = {  # noqa: E305
 
   'lut': _CmdInfo('GetFanSpeedLUT', None, _lut_fmt),
   'fan_lut': 'lut',
+  'suggested_lut': _CmdInfo('GetSuggestedFanSpeedLUT', None, _lut_fmt),
+  'apply_suggested_lut': _CmdInfo('ApplySuggestedFanSpeedLUT', None, _applied_fmt),
+
+  'profile': _CmdInfo('GetProfile'),
+  'fan_profile': 'profile',
+  'set_profile': _CmdInfo('SetProfile', str),
+  'profiles': _CmdInfo('GetProfiles', None, _list_fmt),
+
+  'watchdog': _CmdInfo('GetWatchdogStats', None, _status_fmt),
 
   'pause_button': _CmdInfo('SetPowerControlEnabled', False),
   'resume_button': _CmdInfo('SetPowerControlEnabled', True),
@@ -171,13 +191,41 @@ def argondaemon_main() -> None:
   log_format = '%(levelname)s: %(message)s'
   if not _is_started_by_system():
     log_format = '%(asctime)s: ' + log_format
-  logging.basicConfig(format=log_format, datefmt='%m/%d/%Y %H:%M:%S', level=logging.INFO)
-  daemon = ArgonDaemon()
+  log_handler = logging.StreamHandler()
+  log_handler.setFormatter(logging.Formatter(log_format, datefmt='%m/%d/%Y %H:%M:%S'))
+  log_listener = setup_async_logging(log_handler, level=logging.INFO)
   try:
-    daemon.start()
-    daemon.wait()
+    daemon = ArgonDaemon()
+    try:
+      daemon.start()
+      daemon.wait()
+    finally:
+      daemon.close()
   finally:
-    daemon.close()
+    log_listener.stop()
+
+
+############################################################################
+# Trace replay utility
+
+def _argonreplay_print_usage(program_name=None, file=sys.stderr):
+  if program_name is None:
+    program_name = sys.argv[0]
+  print(f"USAGE: {program_name} trace_file [config_file]\n", file=file)
+
+
+def argonreplay_main() -> None:
+  from .replay import replay_trace
+  if len(sys.argv) < 2 or len(sys.argv) > 3:
+    _error_exit("Wrong number of arguments", usage=_argonreplay_print_usage)
+  result = replay_trace(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+  print(f"Replayed {result.duration:.0f} sec of trace: {len(result.fan_writes)} fan writes, "
+        f"{len(result.notifications)} notifications, {len(result.commands)} commands")
+  if result.truncated_at is not None:
+    print(f"Replay stopped at {result.truncated_at:.0f} sec, where the LUT was set externally")
+  mismatch = result.mismatch()
+  if mismatch is not None:
+    _error_exit(mismatch)
 
 
 ############################################################################
@@ -0,0 +1,191 @@
+# (c) 2020- Spiros Papadimitriou <spapadim@gmail.com>
+#
+# This file is released under the MIT License:
+#    https://opensource.org/licenses/MIT
+# This software is distributed on an "AS IS" basis,
+# WITHOUT WARRANTY OF ANY KIND, either express or implied.
+
+# Deterministic replay of hardware traces (recorded by the daemon when
+# the trace path is configured) against the daemon's control logic.
+# Replay is single-threaded and driven by a virtual clock that jumps from
+# one trace record to the next, so hours of data replay in seconds.
+# Scheduled fan profile switches are replayed from the trace, not re-scheduled.
+# LUTs set externally are not recorded, so replay stops at the first such change.
+
+from . import (ArgonDaemon, ArgonOneBoard, ShutdownOrchestrator, NOTIFY, TRACE_EVENT, BUTTON_PRESS,
+               read_trace)
+
+from typing import Any, List, Optional, Tuple, Union
+
+
+# Stand-in for ArgonOneBoard, which only records what would be done
+class ReplayBoard:
+  def __init__(self, daemon: 'ReplayDaemon', initial_speed: int = 0):
+    self._replay_daemon = daemon
+    self._fan_speed: Optional[int] = None
+    self._last_press_time: Optional[float] = None
+    self.fan_speed = initial_speed
+
+  @property
+  def is_threadsafe(self) -> bool:
+    return True  # Replay is single-threaded
+
+  @property
+  def fan_speed(self) -> Optional[int]:
+    return self._fan_speed
+
+  @fan_speed.setter
+  def fan_speed(self, value: int) -> None:
+    self.set_fan_speed(value)
+
+  def set_fan_speed(self, value: int) -> bool:
+    self._fan_speed = int(max(min(value, 100), 0))
+    self._replay_daemon.result.fan_writes.append((self._replay_daemon.now, self._fan_speed))
+    return True
+
+  def force_fan_speed(self, value: int, timeout: float) -> bool:
+    self.fan_speed = value
+    return True
+
+  @property
+  def last_press_time(self) -> Optional[float]:
+    return self._last_press_time
+
+  def power_off(self) -> None:
+    pass
+
+  def close(self) -> None:
+    pass
+
+
+class _ReplayShutdownOrchestrator(ShutdownOrchestrator):
+  def __init__(self, daemon: 'ReplayDaemon'):
+    super().__init__('')
+    self._replay_daemon = daemon
+
+  def start(self, start_time: Optional[float] = None) -> bool:
+    self._replay_daemon.result.commands.append((self._replay_daemon.now, 'shutdown'))
+    return True
+
+
+class ReplayResult:
+  def __init__(self):
+    self.fan_writes: List[Tuple[float, int]] = []
+    self.expected_fan_writes: List[Tuple[float, int]] = []
+    self.notifications: List[Tuple[float, str, Any]] = []
+    self.expected_notifications: List[Tuple[float, str]] = []
+    self.commands: List[Tuple[float, str]] = []
+    self.duration = 0.0  # Virtual time covered by trace
+    self.truncated_at: Optional[float] = None  # Set if replay stopped early (see above)
+
+  # Returns description of first difference between replayed and recorded
+  # fan writes or notifications (timestamps and notification values are
+  # not compared), or None if they match
+  def mismatch(self) -> Optional[str]:
+    for i, (actual, expected) in enumerate(zip(self.fan_writes, self.expected_fan_writes)):
+      if actual[1] != expected[1]:
+        return (f"Fan write #{i} differs: replayed {actual[1]} at {actual[0]:.1f}s, "
+                f"recorded {expected[1]} at {expected[0]:.1f}s")
+    if len(self.fan_writes) != len(self.expected_fan_writes):
+      return (f"Number of fan writes differs: replayed {len(self.fan_writes)}, "
+              f"recorded {len(self.expected_fan_writes)}")
+    for i, (actual, expected) in enumerate(zip(self.notifications, self.expected_notifications)):
+      if actual[1] != expected[1]:
+        return (f"Notification #{i} differs: replayed {actual[1]} at {actual[0]:.1f}s, "
+                f"recorded {expected[1]} at {expected[0]:.1f}s")
+    if len(self.notifications) != len(self.expected_notifications):
+      return (f"Number of notifications differs: replayed {len(self.notifications)}, "
+              f"recorded {len(self.expected_notifications)}")
+    return None
+
+  def assert_matches_recording(self) -> None:
+    mismatch = self.mismatch()
+    if mismatch is not None:
+      raise AssertionError(mismatch)
+
+
+class ReplayDaemon(ArgonDaemon):
+  def __init__(self, config: dict):
+    config = dict(config, trace_path=None)  # Never record while replaying
+    self.now = 0.0
+    self.result = ReplayResult()
+    self._replay_temperature: Optional[float] = None
+    self._replay_load = 0.0
+    super().__init__(config)
+
+  def _create_board(self) -> ArgonOneBoard:
+    return ReplayBoard(self, initial_speed=0)  # type: ignore
+
+  def _create_shutdown_orchestrator(self) -> ShutdownOrchestrator:
+    return _ReplayShutdownOrchestrator(self)
+
+  def _read_temperature(self) -> Optional[float]:
+    return self._replay_temperature
+
+  def _read_load(self) -> float:
+    return self._replay_load
+
+  def _run_command(self, cmdargs: List[str]) -> None:
+    self.result.commands.append((self.now, ' '.join(cmdargs)))
+
+  def notify(self, notify_type: NOTIFY, value: Optional[Union[bool, float, int, str]] = None) -> None:
+    self.result.notifications.append((self.now, notify_type.value, value))
+
+  def replay(self, trace: List[Tuple[TRACE_EVENT, float, Optional[float]]]) -> ReplayResult:
+    # First temperature reading is taken when fan control is initialized, not by a poll
+    init_index = next((i for i, (event, _, _) in enumerate(trace) if event == TRACE_EVENT.TEMPERATURE), None)
+    if init_index is not None:
+      self._replay_temperature = trace[init_index][2]
+    self._init_subsystems()
+    self._subsystems_ready.set()
+    notify_types = list(NOTIFY)
+    for i, (event, elapsed, value) in enumerate(trace):
+      self.now = elapsed
+      if event == TRACE_EVENT.LUT_SET:
+        self.result.truncated_at = elapsed
+        break
+      elif event == TRACE_EVENT.TEMPERATURE and i != init_index:
+        # Load (if read at all) is read later in the same poll; look ahead for it
+        for next_event, _, next_value in trace[i+1:]:
+          if next_event == TRACE_EVENT.TEMPERATURE:
+            break
+          if next_event == TRACE_EVENT.LOAD and next_value is not None:
+            self._replay_load = next_value
+            break
+        self._replay_temperature = value
+        self._fan_control_thread.poll_once()  # type: ignore
+      elif event == TRACE_EVENT.BUTTON:
+        self._argon_board._last_press_time = elapsed  # type: ignore
+        self._power_control_thread.handle_button(BUTTON_PRESS(int(value)))  # type: ignore
+      elif event == TRACE_EVENT.FAN_SET:
+        self.fan_speed = int(value)  # type: ignore
+      elif event == TRACE_EVENT.FAN_CONTROL:
+        if value:
+          self.enable_fan_control()
+        else:
+          self.disable_fan_control()
+      elif event == TRACE_EVENT.FAN_PROFILE:
+        self.set_fan_profile(self.fan_profiles[int(value)])  # type: ignore
+      elif event == TRACE_EVENT.POWER_CONTROL:
+        if value:
+          self.enable_power_control()
+        else:
+          self.disable_power_control()
+      elif event == TRACE_EVENT.LUT_APPLY_SUGGESTED:
+        self.apply_suggested_fan_speed_lut()
+      elif event == TRACE_EVENT.FAN_FAILSAFE:
+        self.force_fan_speed(int(value))  # type: ignore
+      elif event == TRACE_EVENT.FAN_WRITE:
+        self.result.expected_fan_writes.append((elapsed, int(value)))  # type: ignore
+      elif event == TRACE_EVENT.NOTIFY:
+        self.result.expected_notifications.append((elapsed, notify_types[int(value)].value))  # type: ignore
+      # TRACE_EVENT.LOAD is handled along with TEMPERATURE
+    self.result.duration = self.now
+    return self.result
+
+
+# Replays trace file against daemon configuration (by default, the one the
+# daemon itself would use)
+def replay_trace(trace_path: str, config_path: Optional[str] = None) -> ReplayResult:
+  config = ArgonDaemon.compile_config(ArgonDaemon.load_config(config_path))
+  return ReplayDaemon(config).replay(list(read_trace(trace_path)))
@@ -41,7 +41,14 @@ typedef struct {
   GtkWidget *tray_label;
   GtkWidget *popup_menu;
 
-  GDBusProxy *proxy;
+  GDBusProxy *proxy;  /* NULL until asynchronously created */
+  GCancellable *cancellable;  /* For pending async operations that reference plugin data */
+  guint status_retry_source_id;  /* Pending GetStatus retry, if any */
+
+  /* Coalesced redraw state */
+  guint redraw_source_id;
+  const gchar *icon_name;  /* Currently displayed; always a string literal */
+  gchar *status;  /* Currently displayed */
   
   /* "Model" part of UI */
   gboolean show_label;
@@ -52,16 +59,36 @@ typedef struct {
 } ArgonOnePlugin;
 
 
-static void argonone_update_view (ArgonOnePlugin *aone, gboolean fan_changed, gboolean config_updated);
+#define DBUS_CALL_TIMEOUT_MS 2000
+#define REDRAW_INTERVAL_MS 200  /* Minimum interval between view updates due to D-Bus signals */
+#define STATUS_RETRY_MS 1000  /* Delay before retrying a failed GetStatus call (e.g., daemon still starting) */
+
+static void argonone_update_view (ArgonOnePlugin *aone, gboolean config_updated);
+static void argonone_queue_update_view (ArgonOnePlugin *aone);
+static void argonone_dbus_fetch_status(ArgonOnePlugin *aone);
 
 
 /***********************************************
  * Plugin D-Bus connection(s)                  */
 
+/* Update "model" from a single name/value pair (either from a NotifyValue signal, or GetStatus reply) */
+static void argonone_update_value(ArgonOnePlugin *aone, const gchar *name, GVariant *value_var) {
+  if (!g_strcmp0(name, NOTIFY_VALUE_FAN_SPEED)) {
+    g_variant_get(value_var, "i", &(aone->fan_speed));
+  } else if (!g_strcmp0(name, NOTIFY_VALUE_FAN_CONTROL_ENABLED)) {
+    g_variant_get(value_var, "b", &(aone->is_fan_control_enabled));
+  } else if (!g_strcmp0(name, NOTIFY_VALUE_TEMPERATURE)) {
+    g_variant_get(value_var, "d", &(aone->temperature));
+  } else {
+    return;  /* Not displayed, no need to refresh */
+  }
+  /* Refresh UI view (if anything displayed actually changed) */
+  argonone_queue_update_view(aone);
+}
+
 static void argonone_dbus_signal(GDBusProxy *proxy, gchar *sender_name, 
                                  gchar *signal_name, GVariant *parameters, gpointer user_data) {
   ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
-  gboolean fan_changed = FALSE;
 
   if (sender_name == NULL)  return;  /* Synthesized event from object manager */
   
@@ -69,58 +96,131 @@ static void argonone_dbus_signal(GDBusProxy *proxy, gchar *sender_name,
     gchar *event_name;
     GVariant *value_var;
     g_variant_get(parameters, "(sv)", &event_name, &value_var);
-    if (!g_strcmp0(event_name, NOTIFY_VALUE_FAN_SPEED)) {
-      g_variant_get(value_var, "i", &(aone->fan_speed));
-      fan_changed = TRUE;
-    } else if (!g_strcmp0(event_name, NOTIFY_VALUE_FAN_CONTROL_ENABLED)) {
-      g_variant_get(value_var, "b", &(aone->is_fan_control_enabled));
-      fan_changed = TRUE;
-    } else if (!g_strcmp0(event_name, NOTIFY_VALUE_TEMPERATURE)) {
-      g_variant_get(value_var, "d", &(aone->temperature));
-    }
+    argonone_update_value(aone, event_name, value_var);
+    g_variant_unref(value_var);
     g_free(event_name);
   }
-
-  /* Refresh UI view */
-  argonone_update_view(aone, fan_changed, FALSE);
 }
 
-GVariant *argonone_dbus_method_call_sync(GDBusProxy *proxy, const gchar *method_name, GVariant *parameters) {
+static void argonone_dbus_method_call_done(GObject *source, GAsyncResult *res, gpointer user_data) {
+  const gchar *method_name = (const gchar *)user_data;
   GError *error = NULL;
 
-  
+  GVariant *retval = g_dbus_proxy_call_finish(G_DBUS_PROXY(source), res, &error);
+  if (error) {
+    DEBUG("Failed to call %s method: %s", method_name, error->message);
+    g_error_free(error);
+    return;
+  }
+  g_variant_unref(retval);
+}
+
+/* Fire-and-forget method call; method_name must be a string literal */
+static void argonone_dbus_method_call(GDBusProxy *proxy, const gchar *method_name, GVariant *parameters) {
   if (parameters != NULL && !g_variant_is_of_type(parameters, G_VARIANT_TYPE_TUPLE)) {
     GVariant **t = (GVariant *[]){ parameters };
     parameters = g_variant_new_tuple(t, 1);
   }
 
-  GVariant *retval = g_dbus_proxy_call_sync(proxy, method_name, parameters, 0, -1, NULL, &error);
+  if (proxy == NULL) {
+    DEBUG("Not connected, dropping %s method call", method_name);
+    if (parameters != NULL)
+      g_variant_unref(g_variant_ref_sink(parameters));
+    return;
+  }
+
+  g_dbus_proxy_call(proxy, method_name, parameters, G_DBUS_CALL_FLAGS_NONE, DBUS_CALL_TIMEOUT_MS,
+                    NULL, argonone_dbus_method_call_done, (gpointer)method_name);
+}
+
+static gboolean argonone_dbus_status_retry(gpointer user_data) {
+  ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
+  aone->status_retry_source_id = 0;
+  argonone_dbus_fetch_status(aone);
+  return G_SOURCE_REMOVE;
+}
+
+static void argonone_dbus_status_done(GObject *source, GAsyncResult *res, gpointer user_data) {
+  GError *error = NULL;
+  GVariantIter *iter;
+  gchar *name;
+  GVariant *value_var;
+
+  GVariant *retval = g_dbus_proxy_call_finish(G_DBUS_PROXY(source), res, &error);
   if (error) {
-    DEBUG("Failed to call %s method: %s", method_name, error->message);
+    /* If cancelled, plugin data (user_data) may already be gone */
+    if (!g_error_matches(error, G_IO_ERROR, G_IO_ERROR_CANCELLED)) {
+      ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
+      DEBUG("Failed to call GetStatus method: %s", error->message);
+      /* If daemon went away, status is fetched again once it reappears */
+      gchar *name_owner = g_dbus_proxy_get_name_owner(aone->proxy);
+      if (name_owner != NULL && aone->status_retry_source_id == 0)
+        aone->status_retry_source_id = g_timeout_add(STATUS_RETRY_MS, argonone_dbus_status_retry, aone);
+      g_free(name_owner);
+    }
     g_error_free(error);
+    return;
   }
-  return retval;
+
+  ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
+  g_variant_get(retval, "(a{sv})", &iter);
+  while (g_variant_iter_loop(iter, "{sv}", &name, &value_var))
+    argonone_update_value(aone, name, value_var);
+  g_variant_iter_free(iter);
+  g_variant_unref(retval);
 }
 
+/* Retrieve all current values in a single call */
+static void argonone_dbus_fetch_status(ArgonOnePlugin *aone) {
+  if (aone->status_retry_source_id != 0) {
+    g_source_remove(aone->status_retry_source_id);
+    aone->status_retry_source_id = 0;
+  }
+  g_dbus_proxy_call(aone->proxy, "GetStatus", NULL, G_DBUS_CALL_FLAGS_NONE, DBUS_CALL_TIMEOUT_MS,
+                    aone->cancellable, argonone_dbus_status_done, aone);
+}
 
-gboolean argonone_dbus_query_sync(GDBusProxy *proxy, const gchar *method_name, const gchar *return_format_string, gpointer value) {
-  GVariant *retval;
-  g_assert(value != NULL);
-  if (!(retval = argonone_dbus_method_call_sync(proxy, method_name, NULL)))
-    return FALSE;
-  g_variant_get(retval, return_format_string, value);
-  g_variant_unref(retval);
-  return TRUE;
+/* Daemon (re)started or went away */
+static void argonone_dbus_name_owner_changed(GObject *object, GParamSpec *pspec, gpointer user_data) {
+  ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
+  gchar *name_owner = g_dbus_proxy_get_name_owner(aone->proxy);
+
+  if (name_owner != NULL) {
+    argonone_dbus_fetch_status(aone);
+    g_free(name_owner);
+  } else {
+    aone->fan_speed = -1;
+    argonone_queue_update_view(aone);
+  }
+}
+
+static void argonone_dbus_proxy_ready(GObject *source, GAsyncResult *res, gpointer user_data) {
+  GError *error = NULL;
+
+  GDBusProxy *proxy = g_dbus_proxy_new_for_bus_finish(res, &error);
+  if (error) {
+    /* If cancelled, plugin data (user_data) may already be gone */
+    if (!g_error_matches(error, G_IO_ERROR, G_IO_ERROR_CANCELLED))
+      g_warning("Failed to get dbus proxy: %s", error->message);
+    g_error_free(error);
+    return;
+  }
+
+  ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
+  aone->proxy = proxy;
+  g_signal_connect(aone->proxy, "g-signal", G_CALLBACK(argonone_dbus_signal), aone);
+  g_signal_connect(aone->proxy, "notify::g-name-owner", G_CALLBACK(argonone_dbus_name_owner_changed), aone);
+  argonone_dbus_fetch_status(aone);
 }
 
 /***********************************************
  * Plugin popup menu                           */
 
-/* TODO should we use async call for menu handlers, esp since there is no return value? */
 static void _argonone_set_fan(ArgonOnePlugin *aone, gboolean enabled, gint32 fan_speed) {
-  argonone_dbus_method_call_sync(aone->proxy, "SetFanControlEnabled", g_variant_new_boolean(enabled));
+  /* Calls are sent (and handled by the daemon) in order */
+  argonone_dbus_method_call(aone->proxy, "SetFanControlEnabled", g_variant_new_boolean(enabled));
   if (fan_speed >= 0)  /* -1 denotes "keep current" */
-    argonone_dbus_method_call_sync(aone->proxy, "SetFanSpeed", g_variant_new_int32(fan_speed));
+    argonone_dbus_method_call(aone->proxy, "SetFanSpeed", g_variant_new_int32(fan_speed));
   /* aone "model" will be updated via received signal, which acts as ACK */
 }
 
@@ -186,7 +286,7 @@ static void argonone_configuration_changed(LXPanel *panel, GtkWidget *widget)
 {
     ArgonOnePlugin *aone = lxpanel_plugin_get_data(widget);
     argonone_update_from_settings(aone);
-    argonone_update_view(aone, FALSE, TRUE);
+    argonone_update_view(aone, TRUE);
 }
 
 static gboolean argonone_apply_configuration(gpointer user_data)
@@ -196,7 +296,7 @@ static gboolean argonone_apply_configuration(gpointer user_data)
     config_group_set_int(aone->settings, "ShowLabel", (int)aone->show_label);
     config_group_set_int(aone->settings, "IncludeTemperature", (int)aone->include_temperature);
 
-    argonone_update_view(aone, FALSE, TRUE);
+    argonone_update_view(aone, TRUE);
 
     return TRUE;
 }
@@ -240,42 +340,51 @@ static gboolean argonone_button_press_event(GtkWidget *widget, GdkEventButton *e
 
 #define STATUS_SIZE 32  /* Should never exceed 12 chars +1 '\0' -> 13 bytes */
 
-/* Update all widgets, based on current plugin properties */
-static void argonone_update_view (ArgonOnePlugin *aone, gboolean fan_changed, gboolean config_updated) {
+/* Update all widgets, based on current plugin properties.
+ * Widgets are only touched if what they display has actually changed,
+ * unless config_updated is set. */
+static void argonone_update_view (ArgonOnePlugin *aone, gboolean config_updated) {
   gchar status[STATUS_SIZE];
   gint speed_len;
+  const gchar *icon_name;
+
+  /* Cancel any pending (coalesced) update, since we're doing it now */
+  if (aone->redraw_source_id != 0) {
+    g_source_remove(aone->redraw_source_id);
+    aone->redraw_source_id = 0;
+  }
 
   /* Update icon */
-  if (fan_changed) {
-    gchar *icon_name = NULL;
-    if (!aone->is_fan_control_enabled) {
-      icon_name = "argonone-fan-paused";
-    } else if (aone->fan_speed == 0) {
-      icon_name = "argonone-fan";
-    } else if (aone->fan_speed <= 50) {
-      icon_name = "argonone-fan-medium";
-    } else {
-      icon_name = "argonone-fan-high";
-    }
+  if (!aone->is_fan_control_enabled) {
+    icon_name = "argonone-fan-paused";
+  } else if (aone->fan_speed == 0) {
+    icon_name = "argonone-fan";
+  } else if (aone->fan_speed <= 50) {
+    icon_name = "argonone-fan-medium";
+  } else {
+    icon_name = "argonone-fan-high";
+  }
+  if (config_updated || g_strcmp0(icon_name, aone->icon_name)) {
     lxpanel_plugin_set_taskbar_icon(
         aone->panel, aone->tray_icon,
         icon_name);
+    aone->icon_name = icon_name;
   }
 
   if (config_updated)
     gtk_widget_set_visible(aone->tray_label, aone->show_label);
 
-  if (config_updated || fan_changed || aone->include_temperature) {  /* Assume temperature always changes */
-    /* Construct status string with fan speed and (optionally) temperature */
-    if (aone->fan_speed < 0) {
-      speed_len = g_snprintf(status, STATUS_SIZE, " -- ");
-    } else {
-      speed_len = g_snprintf(status, STATUS_SIZE, "%3d%%", aone->fan_speed);
-    }
-    if (aone->include_temperature) {
-      g_snprintf(status + speed_len, STATUS_SIZE - speed_len, " / %4.1fC", aone->temperature);
-    }
+  /* Construct status string with fan speed and (optionally) temperature */
+  if (aone->fan_speed < 0) {
+    speed_len = g_snprintf(status, STATUS_SIZE, " -- ");
+  } else {
+    speed_len = g_snprintf(status, STATUS_SIZE, "%3d%%", aone->fan_speed);
+  }
+  if (aone->include_temperature) {
+    g_snprintf(status + speed_len, STATUS_SIZE - speed_len, " / %4.1fC", aone->temperature);
+  }
 
+  if (config_updated || g_strcmp0(status, aone->status)) {
     /* Update label and/or tooltip */
     if (aone->show_label) {
       // gtk_label_set_width_chars(GTK_LABEL(aone->tray_label), aone->include_temperature ? 12 : 4);
@@ -286,19 +395,44 @@ static void argonone_update_view (ArgonOnePlugin *aone, gboolean fan_changed, gb
     } else {
       gtk_widget_set_tooltip_text(aone->plugin, status);
     }
+    g_free(aone->status);
+    aone->status = g_strdup(status);
   }
 }
 
+static gboolean argonone_update_view_timeout(gpointer user_data) {
+  ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
+
+  aone->redraw_source_id = 0;
+  argonone_update_view(aone, FALSE);
+  return G_SOURCE_REMOVE;
+}
+
+/* Schedule a view update, coalescing bursts of model changes into one update */
+static void argonone_queue_update_view (ArgonOnePlugin *aone) {
+  if (aone->redraw_source_id == 0)
+    aone->redraw_source_id = g_timeout_add(REDRAW_INTERVAL_MS, argonone_update_view_timeout, aone);
+}
+
 /* Plugin destructor */
 static void argonone_destructor(gpointer user_data)
 {
   ArgonOnePlugin *aone = (ArgonOnePlugin *)user_data;
   
   if (aone->popup_menu != NULL) gtk_widget_destroy(aone->popup_menu);
-  
-  g_object_unref(aone->proxy);
 
-  /* TODO ? */
+  /* Pending async callbacks must not touch aone after this */
+  g_cancellable_cancel(aone->cancellable);
+  g_object_unref(aone->cancellable);
+  if (aone->redraw_source_id != 0) g_source_remove(aone->redraw_source_id);
+  if (aone->status_retry_source_id != 0) g_source_remove(aone->status_retry_source_id);
+
+  if (aone->proxy != NULL) {
+    g_signal_handlers_disconnect_by_data(aone->proxy, aone);
+    g_object_unref(aone->proxy);
+  }
+
+  g_free(aone->status);
 
   g_free(aone);
 }
@@ -310,7 +444,6 @@ static GtkWidget *argonone_constructor(LXPanel *panel, config_setting_t *setting
   /* Allocate and initialize plugin context */
   ArgonOnePlugin *aone;
   GtkWidget *hbox;
-  GError *error;
 
   aone = g_new0(ArgonOnePlugin, 1);
 
@@ -344,27 +477,17 @@ static GtkWidget *argonone_constructor(LXPanel *panel, config_setting_t *setting
   /* Update "model" from config settings */
   argonone_update_from_settings(aone);
 
-  /* Set up D-Bus connection, using object manager */
-  error = NULL;
-  aone->proxy = g_dbus_proxy_new_for_bus_sync(G_BUS_TYPE_SYSTEM, 0, NULL, "net.clusterhack.ArgonOne", "/net/clusterhack/ArgonOne", "net.clusterhack.ArgonOne", NULL, &error);
-  if (error) {
-    g_error("Failed to get dbus proxy: %s", error->message);
-    g_error_free(error);
-    /* gtk_exit(-1); */
-  }
-  g_signal_connect(aone->proxy, "g-signal", G_CALLBACK(argonone_dbus_signal),
-                   aone);
-
-  /* Retrieve current fan control and speed values; blocking is ok on startup */
-  argonone_dbus_query_sync(aone->proxy, "GetFanSpeed", "(i)", &(aone->fan_speed));
-  argonone_dbus_query_sync(aone->proxy, "GetFanControlEnabled", "(b)", &(aone->is_fan_control_enabled));
-  argonone_dbus_query_sync(aone->proxy, "GetTemperature", "(d)", &(aone->temperature));
+  /* Set up D-Bus connection asynchronously; initial values are fetched once proxy is ready */
+  aone->cancellable = g_cancellable_new();
+  g_dbus_proxy_new_for_bus(G_BUS_TYPE_SYSTEM, G_DBUS_PROXY_FLAGS_NONE, NULL,
+                           "net.clusterhack.ArgonOne", "/net/clusterhack/ArgonOne", "net.clusterhack.ArgonOne",
+                           aone->cancellable, argonone_dbus_proxy_ready, aone);
 
   /* Update UI view */
 
   /* Show widget and return */
   gtk_widget_show_all(aone->plugin);
-  argonone_update_view(aone, TRUE, TRUE);  /* After _show_all(), since it updates label visibility */
+  argonone_update_view(aone, TRUE);  /* After _show_all(), since it updates label visibility */
   return aone->plugin;
 }
 
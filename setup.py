@@ -17,6 +17,7 @@ setup(
       "argonctl = argonone.cmdline:argonctl_main",
       "argononed = argonone.cmdline:argondaemon_main",
       "argonone-shutdown = argonone.cmdline:argonshutdown_main",
+      "argonone-replay = argonone.cmdline:argonreplay_main",
     ],
   },
 
@@ -0,0 +1,82 @@
+# (c) 2020- Spiros Papadimitriou <spapadim@gmail.com>
+#
+# This file is released under the MIT License:
+#    https://opensource.org/licenses/MIT
+# This software is distributed on an "AS IS" basis,
+# WITHOUT WARRANTY OF ANY KIND, either express or implied.
+
+# Closed-loop checks of FanEffectivenessModel: a simulated Pi whose fan
+# speed is picked by the LUT from (simulated) temperature readings.
+
+import math
+import random
+
+import pytest
+
+try:
+  from argonone import FanEffectivenessModel, StepFunction
+except (ImportError, RuntimeError):  # RPi.GPIO raises RuntimeError when not on a Pi
+  pytest.skip("argonone dependencies (smbus, RPi.GPIO, dbus, gi) not available", allow_module_level=True)
+
+
+# Same as in argonone.yaml
+_LUT = StepFunction.from_config_lut([
+  {'default': 0}, {50: 2}, {55: 3}, {56: 10}, {57: 30}, {58: 55}, {59: 75}, {60: 100},
+])
+_POLL_INTERVAL_SEC = 10.0
+_TIME_CONSTANT_SEC = 120.0
+
+
+def _linear_cooling(speed):
+  return 20.0 * speed / 100  # Up to 20 degrees, no saturation
+
+
+def _saturating_cooling(speed):
+  return 20.0 * min(speed, 40) / 40  # Nothing gained above speed 40
+
+
+def _simulate(cooling, ambient_temp, num_polls=20000, seed=0):
+  rnd = random.Random(seed)
+  model = FanEffectivenessModel()
+  decay = math.exp(-_POLL_INTERVAL_SEC / _TIME_CONSTANT_SEC)
+  temperature, load, speed = ambient_temp, 0.3, 0
+  for _ in range(num_polls):
+    if rnd.random() < 0.02:
+      load = rnd.choice([0.05, 0.2, 0.5, 0.8, 1.0])
+    steady_temp = ambient_temp + 30 + 15 * load - cooling(speed)
+    temperature = steady_temp + (temperature - steady_temp) * decay
+    reading = round(temperature, 1)
+    model.update(speed, reading, load, _POLL_INTERVAL_SEC)
+    speed = round(_LUT(reading))
+  return model
+
+
+@pytest.mark.parametrize('ambient_temp', [25.0, 35.0])
+def test_linear_cooling_is_not_capped(ambient_temp):
+  # Faster speeds are always seen at higher temperatures; this must not be
+  # mistaken for saturation
+  model = _simulate(_linear_cooling, ambient_temp)
+  assert model.num_samples > 0
+  assert model.saturation_speed() is None
+  assert model.suggest_lut(_LUT) is None
+
+
+def test_saturating_cooling_is_capped():
+  model = _simulate(_saturating_cooling, 35.0)
+  lut = model.suggest_lut(_LUT)
+  assert lut is not None
+  expected = dict(_LUT.items())
+  expected[59] = 55  # 60 and above is safety range, and 58: 55 is below cap
+  assert dict(lut.items()) == expected
+
+
+def test_faster_speed_hotter_is_rejected():
+  model = FanEffectivenessModel(min_samples=2)
+  for _ in range(5):
+    # Temperature rises faster after switching up (e.g., ambient heating up)
+    model.update(55, 58.0, 0.5, _POLL_INTERVAL_SEC)
+    model.update(55, 58.0, 0.5, _POLL_INTERVAL_SEC)
+    model.update(75, 59.0, 0.5, _POLL_INTERVAL_SEC)
+    model.reset()
+  assert model.num_samples == 5
+  assert model.saturation_speed(75) is None